@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+from db_manager import storage
+
+# Bars after the signal a trade may stay open before it is closed at market
+MAX_HOLDING_BARS = 20
+# Signals per block when building the signal x bar price windows
+BLOCK_SIZE = 100_000
+
+
+def load_backtest_data(tickers=None):
+    where, params = "", {}
+    if tickers is not None:
+        where, params = " WHERE ticker = ANY(:tickers)", {"tickers": list(tickers)}
+    signals = storage.read_numpy(
+        "SELECT ticker, signal_type, date, stock_price, stop_loss, "
+        f"take_profit FROM signals{where}",
+        params,
+    )
+    stocks = storage.read_numpy(
+        f"SELECT ticker, date, high, low, close FROM stocks{where}", params
+    )
+    return signals, stocks
+
+
+def as_datetime64(dates):
+    # Bulk reads already return datetime64, which pd.to_datetime is slow to re-check
+    dates = pd.Series(dates)
+    if pd.api.types.is_datetime64_dtype(dates):
+        return dates.to_numpy()
+    return pd.to_datetime(dates).to_numpy()
+
+
+def bar_keys(tickers, dates, categories):
+    # One sortable int64 per (ticker, date): ticker code in the high bits
+    codes = pd.Categorical(tickers, categories=categories).codes.astype(np.int64)
+    days = as_datetime64(dates).astype("datetime64[D]").astype(np.int64)
+    return (codes << 32) + days, codes
+
+
+EXIT_REASONS = ["stop_loss", "take_profit", "timeout"]
+
+
+def first_exits(
+    entry_index,
+    last_index,
+    direction,
+    stop,
+    target,
+    high,
+    low,
+    close,
+    max_holding_bars=MAX_HOLDING_BARS,
+):
+    """Exit bar, price and EXIT_REASONS code for trades entered at entry_index.
+
+    Bars are searched up to max_holding_bars after the entry and never past
+    last_index; direction is +1 for longs and -1 for shorts.
+    """
+    exit_index = np.empty(len(entry_index), dtype=np.int64)
+    exit_price = np.empty(len(entry_index))
+    exit_code = np.empty(len(entry_index), dtype=np.int8)
+    steps = np.arange(1, max_holding_bars + 1)
+
+    for block in range(0, len(entry_index), BLOCK_SIZE):
+        rows = slice(block, block + BLOCK_SIZE)
+        last = np.minimum(entry_index[rows] + max_holding_bars, last_index[rows])
+        window = entry_index[rows, None] + steps
+        valid = window <= last[:, None]
+        window = np.minimum(window, len(close) - 1)
+
+        long = direction[rows, None] > 0
+        window_high, window_low = high[window], low[window]
+        stop_hit = valid & np.where(
+            long,
+            window_low <= stop[rows, None],
+            window_high >= stop[rows, None],
+        )
+        target_hit = valid & np.where(
+            long,
+            window_high >= target[rows, None],
+            window_low <= target[rows, None],
+        )
+
+        # First bar touching each level; max_holding_bars means never
+        first_stop = np.where(
+            stop_hit.any(axis=1), stop_hit.argmax(axis=1), max_holding_bars
+        )
+        first_target = np.where(
+            target_hit.any(axis=1), target_hit.argmax(axis=1), max_holding_bars
+        )
+        stopped = (first_stop <= first_target) & (first_stop < max_holding_bars)
+        targeted = (first_target < first_stop) & (first_target < max_holding_bars)
+
+        block_exit = np.where(
+            stopped,
+            entry_index[rows] + 1 + first_stop,
+            np.where(targeted, entry_index[rows] + 1 + first_target, last),
+        )
+        exit_index[rows] = block_exit
+        exit_price[rows] = np.where(
+            stopped, stop[rows], np.where(targeted, target[rows], close[block_exit])
+        )
+        exit_code[rows] = np.where(stopped, 0, np.where(targeted, 1, 2))
+    return exit_index, exit_price, exit_code
+
+
+def resolve_trades(signals, stocks, max_holding_bars=MAX_HOLDING_BARS):
+    """Resolve every signal's exit from the following bars' high/low path.
+
+    Buy signals are held long and sell signals short, entering at the
+    signal's stock_price. A long exits at stop_loss or take_profit; for a
+    short the two stored levels swap roles (stop_loss, below the entry, is
+    its target). The first bar touching either level closes the trade, the
+    stop winning when a bar touches both; otherwise the trade closes at the
+    close of the last bar within max_holding_bars (or of the ticker's data).
+    """
+    categories = pd.unique(stocks["ticker"])
+    stock_keys, stock_codes = bar_keys(stocks["ticker"], stocks["date"], categories)
+    order = np.argsort(stock_keys, kind="stable")
+    stock_keys, stock_codes = stock_keys[order], stock_codes[order]
+    high = stocks["high"].to_numpy(dtype=float)[order]
+    low = stocks["low"].to_numpy(dtype=float)[order]
+    close = stocks["close"].to_numpy(dtype=float)[order]
+    stock_dates = as_datetime64(stocks["date"])[order]
+
+    signal_keys, signal_codes = bar_keys(signals["ticker"], signals["date"], categories)
+    entry_index = np.searchsorted(stock_keys, signal_keys).clip(max=len(stock_keys) - 1)
+    # Signals without a matching bar can't be resolved
+    matched = (signal_codes >= 0) & (stock_keys[entry_index] == signal_keys)
+    signals = signals[matched].reset_index(drop=True)
+    signal_keys, signal_codes = signal_keys[matched], signal_codes[matched]
+    entry_index = entry_index[matched]
+    # Last bar index belonging to each signal's ticker
+    ticker_end = np.searchsorted(stock_codes, signal_codes, side="right") - 1
+
+    direction = np.where(
+        signals["signal_type"].astype(str).str.contains("Sell"), -1.0, 1.0
+    )
+    entry = signals["stock_price"].to_numpy(dtype=float)
+    stop = np.where(direction > 0, signals["stop_loss"], signals["take_profit"])
+    target = np.where(direction > 0, signals["take_profit"], signals["stop_loss"])
+
+    exit_index, exit_price, exit_code = first_exits(
+        entry_index,
+        ticker_end,
+        direction,
+        stop,
+        target,
+        high,
+        low,
+        close,
+        max_holding_bars,
+    )
+    exit_reason = np.array(EXIT_REASONS)[exit_code]
+
+    trades = signals[["ticker", "signal_type", "date"]].copy()
+    trades["direction"] = np.where(direction > 0, "long", "short")
+    trades["entry_price"] = entry
+    trades["exit_date"] = stock_dates[exit_index]
+    trades["exit_price"] = exit_price
+    trades["exit_reason"] = pd.Categorical(exit_reason, categories=EXIT_REASONS)
+    trades["bars_held"] = exit_index - entry_index
+    trades["pnl"] = (exit_price - entry) * direction
+    trades["return"] = trades["pnl"] / entry
+    return trades
+
+
+def summarize(trades):
+    """Per-ticker and aggregate trade count, P&L, hit rate and max drawdown.
+
+    Drawdown is the largest peak-to-trough fall of cumulative trade returns,
+    taking trades in exit order.
+    """
+    trades = trades.sort_values(["exit_date", "ticker"], kind="stable").assign(
+        hit=lambda t: t["exit_reason"] == "take_profit",
+        win=lambda t: t["return"] > 0,
+    )
+    equity = trades.groupby("ticker", observed=True)["return"].cumsum()
+    peak = equity.groupby(trades["ticker"], observed=True).cummax().clip(lower=0)
+    trades["drawdown"] = equity - peak
+    grouped = trades.groupby("ticker", observed=True)
+
+    per_ticker = pd.DataFrame(
+        {
+            "trades": grouped.size(),
+            "total_pnl": grouped["pnl"].sum(),
+            "total_return": grouped["return"].sum(),
+            "mean_return": grouped["return"].mean(),
+            "hit_rate": grouped["hit"].mean(),
+            "win_rate": grouped["win"].mean(),
+            "max_drawdown": grouped["drawdown"].min(),
+        }
+    )
+
+    overall_equity = trades["return"].cumsum()
+    aggregate = {
+        "trades": len(trades),
+        "total_pnl": trades["pnl"].sum(),
+        "total_return": trades["return"].sum(),
+        "mean_return": trades["return"].mean(),
+        "hit_rate": trades["hit"].mean(),
+        "win_rate": trades["win"].mean(),
+        "max_drawdown": (overall_equity - overall_equity.cummax().clip(lower=0)).min(),
+    }
+    return per_ticker, aggregate
+
+
+def run_backtest(tickers=None, max_holding_bars=MAX_HOLDING_BARS):
+    signals, stocks = load_backtest_data(tickers)
+    trades = resolve_trades(signals, stocks, max_holding_bars)
+    return (trades, *summarize(trades))
+
+
+if __name__ == "__main__":
+    trades, per_ticker, aggregate = run_backtest()
+    print(per_ticker.to_string())
+    print("-" * 50)
+    for name, value in aggregate.items():
+        print(f"{name:<14}{value:>14.4f}")
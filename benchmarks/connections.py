@@ -0,0 +1,148 @@
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import psycopg2
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from benchmarks.synthetic import synthetic_market
+from db_manager import create_tables, load_stock_data, storage
+from storage import POOL_OPTIONS, DuckDBStorage
+
+# Run from the repository root: python -m benchmarks.connections [checkouts] [threads]
+#
+# Times how long callers wait for a usable connection: a fresh psycopg2
+# connection per call (the old main.fetch_data_from_db), an engine without a
+# pool, the shared pool with and without pre-ping, and a DuckDB cursor. Then
+# times a one-ticker read through the old and the current path.
+
+BENCH_TICKER = "BENCH_CONN"
+
+
+def percentiles(timings):
+    micros = np.array(timings) * 1e6
+    return np.percentile(micros, 50), np.percentile(micros, 99)
+
+
+def acquire(checkout, count, threads=1):
+    def run(_):
+        timings = []
+        for _ in range(count // threads):
+            start = time.perf_counter()
+            release = checkout()
+            timings.append(time.perf_counter() - start)
+            release()
+        return timings
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return [t for timings in executor.map(run, range(threads)) for t in timings]
+
+
+def psycopg2_checkout(dsn):
+    def checkout():
+        connection = psycopg2.connect(dsn)
+        return connection.close
+
+    return checkout
+
+
+def engine_checkout(engine):
+    def checkout():
+        connection = engine.connect()
+        # The DBAPI connection is only checked out once something needs it
+        connection.connection
+        return connection.close
+
+    return checkout
+
+
+def duckdb_checkout(duckdb_storage):
+    def checkout():
+        context = duckdb_storage.cursor()
+        context.__enter__()
+        return lambda: context.__exit__(None, None, None)
+
+    return checkout
+
+
+def legacy_fetch(dsn, ticker):
+    # The old main.fetch_data_from_db: a connection per call, ticker in the SQL
+    connection = psycopg2.connect(dsn)
+    try:
+        query = f"SELECT * FROM stocks WHERE ticker = '{ticker}' ORDER BY date"
+        return pd.read_sql_query(query, connection)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    checkouts = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    if storage.name != "postgresql":
+        sys.exit("Point DATABASE_URL at PostgreSQL to time connection checkouts")
+
+    url = storage.engine.url
+    dsn = url.render_as_string(hide_password=False).replace(
+        "postgresql+psycopg2://", "postgresql://"
+    )
+    unpooled = create_engine(url, poolclass=NullPool)
+    without_ping = create_engine(url, **{**POOL_OPTIONS, "pool_pre_ping": False})
+    duckdb_storage = DuckDBStorage(os.path.join(tempfile.mkdtemp(), "bench.duckdb"))
+
+    paths = {
+        "psycopg2.connect per call": psycopg2_checkout(dsn),
+        "engine without pool": engine_checkout(unpooled),
+        "pool, no pre-ping": engine_checkout(without_ping),
+        "pool (storage.engine)": engine_checkout(storage.engine),
+        "DuckDB cursor": duckdb_checkout(duckdb_storage),
+    }
+
+    print("-" * 66)
+    print(f"{'Checkout':<28}{'p50 (us)':>10}{'p99 (us)':>10}")
+    for name, checkout in paths.items():
+        # Warm the pool so its connections already exist
+        acquire(checkout, threads * 2, threads)
+        p50, p99 = percentiles(acquire(checkout, checkouts))
+        print(f"{name:<28}{p50:>10.0f}{p99:>10.0f}")
+
+    print("-" * 66)
+    print(f"{threads} threads checking out at once")
+    for name in ("psycopg2.connect per call", "pool (storage.engine)"):
+        p50, p99 = percentiles(acquire(paths[name], checkouts, threads))
+        print(f"{name:<28}{p50:>10.0f}{p99:>10.0f}")
+
+    create_tables()
+    with storage.transaction() as transaction:
+        transaction.execute(
+            "DELETE FROM stocks WHERE ticker = :ticker", {"ticker": BENCH_TICKER}
+        )
+    load_stock_data({BENCH_TICKER: synthetic_market(1, bars=2500)["SYN0000"]})
+    query = "SELECT * FROM stocks WHERE ticker = :ticker ORDER BY date"
+    reads = {
+        "psycopg2 + f-string": lambda: legacy_fetch(dsn, BENCH_TICKER),
+        "storage.read_frame": lambda: storage.read_frame(
+            query, {"ticker": BENCH_TICKER}
+        ),
+        "storage.read_numpy": lambda: storage.read_numpy(
+            query, {"ticker": BENCH_TICKER}
+        ),
+    }
+    print("-" * 66)
+    print(f"{'One-ticker read (2500 bars)':<28}{'p50 (us)':>10}{'p99 (us)':>10}")
+    for name, read in reads.items():
+        timings = []
+        for _ in range(max(checkouts // 10, 20)):
+            start = time.perf_counter()
+            read()
+            timings.append(time.perf_counter() - start)
+        p50, p99 = percentiles(timings)
+        print(f"{name:<28}{p50:>10.0f}{p99:>10.0f}")
+
+    with storage.transaction() as transaction:
+        transaction.execute(
+            "DELETE FROM stocks WHERE ticker = :ticker", {"ticker": BENCH_TICKER}
+        )
+    duckdb_storage.dispose()
@@ -0,0 +1,50 @@
+import sys
+import tempfile
+import time
+from benchmarks.synthetic import synthetic_market
+from fetchers import FileProvider, fetch_historical_data
+
+# Run from the repository root: python -m benchmarks.fetch [tickers] [latency_ms]
+
+
+class SlowFileProvider(FileProvider):
+    # Adds a fixed per-request delay to stand in for network round trips
+    name = "file (simulated latency)"
+
+    def __init__(self, directory, latency):
+        super().__init__(directory)
+        self.latency = latency
+
+    def fetch(self, ticker, start_date, end_date):
+        time.sleep(self.latency)
+        return super().fetch(ticker, start_date, end_date)
+
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 250) / 1000
+
+    with tempfile.TemporaryDirectory() as directory:
+        names = [f"T{i:04d}" for i in range(tickers)]
+        market = synthetic_market(tickers, start="2000-01-03", bars=1000)
+        for name, history in zip(names, market.values()):
+            history.to_parquet(f"{directory}/{name}.parquet")
+        provider = SlowFileProvider(directory, latency)
+
+        timings = {}
+        for workers in (1, 8, 32):
+            start = time.perf_counter()
+            data_dict = fetch_historical_data(
+                names,
+                "2000-01-01",
+                "2010-01-01",
+                provider=provider,
+                max_workers=workers,
+            )
+            timings[workers] = time.perf_counter() - start
+            assert list(data_dict) == names
+
+    print("-" * 50)
+    print(f"Tickers: {tickers}, simulated latency: {latency * 1000:.0f}ms")
+    for workers, seconds in timings.items():
+        print(f"{workers:>3} workers: {seconds:.2f}s")
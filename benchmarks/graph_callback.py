@@ -0,0 +1,90 @@
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import app
+from benchmarks.synthetic import synthetic_market
+from db_manager import create_tables, load_stock_data, storage
+
+# Run from the repository root: python -m benchmarks.graph_callback [tickers] [users]
+#
+# Cold stock-graph callback latency as more tickers are selected, loading them
+# one query per ticker (the old callback) or all in one query, then the same
+# callback issued by several users at once on the threaded server.
+
+PREFIX = "BENCH_GRAPH_"
+
+
+def per_ticker_reads(tickers):
+    query = "SELECT * FROM stocks WHERE ticker = :ticker ORDER BY date"
+    return [storage.read_frame(query, {"ticker": ticker}) for ticker in tickers]
+
+
+def graph_request(client, selected):
+    payload = {
+        "output": "stock-graph.figure",
+        "outputs": {"id": "stock-graph", "property": "figure"},
+        "inputs": [
+            {"id": "stock-dropdown", "property": "value", "value": selected},
+            {"id": "stock-graph", "property": "relayoutData", "value": None},
+            {"id": "graph-width", "property": "data", "value": None},
+        ],
+        "changedPropIds": ["stock-dropdown.value"],
+        "state": [],
+    }
+    start = time.perf_counter()
+    response = client.post("/_dash-update-component", json=payload)
+    assert response.status_code == 200, response.status_code
+    return time.perf_counter() - start
+
+
+def median_of(function, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        app.query_cache.clear()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    market = synthetic_market(count, years=5)
+    market = {PREFIX + ticker: df for ticker, df in market.items()}
+    tickers = list(market)
+    create_tables()
+    load_stock_data(market)
+    client = app.app.server.test_client()
+
+    print("-" * 60)
+    print(f"{'Tickers':<10}{'per-ticker reads':>18}{'one query':>12}{'callback':>12}")
+    selections = sorted({1, 4, count})
+    for n in selections:
+        selected = tickers[:n]
+        serial = median_of(lambda: per_ticker_reads(selected))
+        batched = median_of(lambda: app.query_stock_data(selected))
+        callback = median_of(lambda: graph_request(client, selected))
+        print(f"{n:<10}{serial:>17.3f}s{batched:>11.3f}s{callback:>11.3f}s")
+
+    print("-" * 60)
+    selected = tickers[:4]
+    app.query_cache.clear()
+    alone = graph_request(client, selected)
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        app.query_cache.clear()
+        latencies = list(
+            executor.map(lambda _: graph_request(client, selected), range(users * 4))
+        )
+    print(f"One user, cold:           {alone:.3f}s")
+    print(
+        f"{users} users at once:         median {statistics.median(latencies):.3f}s, "
+        f"max {max(latencies):.3f}s"
+    )
+
+    with storage.transaction() as transaction:
+        transaction.execute(
+            "DELETE FROM stocks WHERE ticker = ANY(:tickers)", {"tickers": tickers}
+        )
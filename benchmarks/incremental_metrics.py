@@ -0,0 +1,69 @@
+import sys
+import time
+import numpy as np
+from benchmarks.synthetic import synthetic_market
+from main import METRICS_LOOKBACK, calculate_incremental_metrics, calculate_metrics
+
+# Run from the repository root: python -m benchmarks.incremental_metrics [bars] [new]
+METRIC_NAMES = [
+    "10_day_MA",
+    "50_day_MA",
+    "200_day_MA",
+    "RSI",
+    "12_day_EMA",
+    "26_day_EMA",
+    "MACD",
+    "Signal_Line",
+]
+
+
+def stocks_frame(bars, seed=0):
+    # Shape a synthetic history like a SELECT * FROM stocks result
+    df = synthetic_market(1, seed=seed, bars=bars)["SYN0000"].reset_index()
+    df.columns = [column.lower().replace(" ", "_") for column in df.columns]
+    df["date"] = df["date"].dt.date
+    return df
+
+
+if __name__ == "__main__":
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    new_bars = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    df = stocks_frame(bars)
+    split = bars - new_bars
+    # Load the compiled indicator kernel outside the timing
+    calculate_metrics(df.head(300).copy())
+
+    start = time.perf_counter()
+    full = calculate_metrics(df.copy())
+    full_seconds = time.perf_counter() - start
+
+    # Persisted state is the last already-computed bar, as update_metrics_incremental reads it
+    persisted = full.iloc[split - 1]
+    state = {
+        "date": persisted["date"],
+        "twelve_day_EMA": persisted["12_day_EMA"],
+        "twenty_six_day_EMA": persisted["26_day_EMA"],
+        "Signal_Line": persisted["Signal_Line"],
+    }
+    tail = df.iloc[max(split - METRICS_LOOKBACK, 0) :]
+
+    start = time.perf_counter()
+    incremental = calculate_incremental_metrics(tail, state)
+    incremental_seconds = time.perf_counter() - start
+
+    expected = full.iloc[split:]
+    assert list(incremental["date"]) == list(expected["date"])
+    for name in METRIC_NAMES:
+        np.testing.assert_allclose(
+            incremental[name].to_numpy(),
+            expected[name].to_numpy(),
+            rtol=1e-9,
+            atol=1e-9,
+            err_msg=name,
+        )
+
+    print("-" * 50)
+    print(f"Bars: {bars}, new bars: {new_bars} (matches full recompute)")
+    print(f"Full recompute: {full_seconds * 1000:.2f}ms")
+    print(f"Incremental:    {incremental_seconds * 1000:.2f}ms")
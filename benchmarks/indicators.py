@@ -0,0 +1,63 @@
+import sys
+import time
+import tracemalloc
+import numpy as np
+from benchmarks.incremental_metrics import stocks_frame
+from indicators import DEFAULT_COLUMNS, compiled_default_kernel, default_indicators
+from main import calculate_metrics, compute_indicators
+
+# Run from the repository root: python -m benchmarks.indicators [bars] [repeats]
+
+
+def measure(function, repeats):
+    # Best wall time over the repeats, and peak traced allocation of one call
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+if __name__ == "__main__":
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    df = stocks_frame(bars)
+    close = df["close"].to_numpy()
+    # The pandas path (the one panels take) as a one-column close matrix
+    pandas_path = lambda: compute_indicators(df[["close"]])
+    reference = {name: frame["close"] for name, frame in pandas_path().items()}
+
+    candidates = {
+        "pandas": pandas_path,
+        "calculate_metrics": lambda: calculate_metrics(df.copy()),
+        "NumPy kernels": lambda: default_indicators(close, use_numba=False),
+    }
+    if compiled_default_kernel is not None:
+        default_indicators(close[:300], use_numba=True)  # compile outside the timing
+        candidates["Numba fused pass"] = lambda: default_indicators(
+            close, use_numba=True
+        )
+
+    print("-" * 50)
+    print(f"Bars: {bars}")
+    print(f"{'':<20}{'time (ms)':>12}{'peak alloc (MB)':>18}")
+    for name, function in candidates.items():
+        seconds, peak = measure(function, repeats)
+        if name != "pandas":
+            result = function()
+            for column in DEFAULT_COLUMNS:
+                np.testing.assert_allclose(
+                    result[column],
+                    reference[column].to_numpy(),
+                    rtol=1e-9,
+                    # MACD is a small difference of two price-sized EMAs
+                    atol=1e-12 * np.abs(close).max(),
+                    err_msg=f"{name}: {column}",
+                )
+        print(f"{name:<20}{seconds * 1000:>12.2f}{peak / 1024**2:>18.2f}")
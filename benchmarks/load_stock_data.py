@@ -0,0 +1,70 @@
+import sys
+import time
+from sqlalchemy.orm import Session
+from benchmarks.synthetic import synthetic_market
+from db_manager import create_tables, engine, load_stock_data, storage, Stock
+
+# Run from the repository root: python -m benchmarks.load_stock_data [tickers] [bars]
+
+
+def legacy_insert_stock_data(ticker, data_frame):
+    # The original ORM path, kept here as the baseline
+    data_frame = data_frame.reset_index()
+    entries = [
+        Stock(
+            ticker=ticker,
+            date=row["Date"].date(),
+            open=row["Open"],
+            high=row["High"],
+            low=row["Low"],
+            close=row["Close"],
+            volume=int(row["Volume"]),
+            dividends=row["Dividends"],
+            stock_splits=row["Stock Splits"],
+        )
+        for _, row in data_frame.iterrows()
+    ]
+    with Session(engine) as db_session, db_session.begin():
+        db_session.bulk_save_objects(entries)
+
+
+def clear_bench_rows():
+    with storage.transaction() as transaction:
+        transaction.execute("DELETE FROM stocks WHERE ticker LIKE 'BENCH_LOAD_%'")
+
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    bars = int(sys.argv[2]) if len(sys.argv) > 2 else 2500
+    if storage.name != "postgresql":
+        sys.exit("Point DATABASE_URL at PostgreSQL; the ORM baseline needs it")
+
+    engine.echo = False
+    market = synthetic_market(tickers, bars=bars)
+    data_dict = {"BENCH_LOAD_" + ticker: df for ticker, df in market.items()}
+
+    create_tables()
+    clear_bench_rows()
+
+    start = time.perf_counter()
+    for ticker, data in data_dict.items():
+        legacy_insert_stock_data(ticker, data)
+    legacy_seconds = time.perf_counter() - start
+    clear_bench_rows()
+
+    start = time.perf_counter()
+    load_stock_data(data_dict)
+    copy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    inserted, updated = load_stock_data(data_dict)
+    rerun_seconds = time.perf_counter() - start
+    clear_bench_rows()
+
+    print("-" * 50)
+    print(f"Rows:             {tickers * bars}")
+    print(f"ORM bulk save:    {legacy_seconds:.3f}s")
+    print(f"COPY upsert:      {copy_seconds:.3f}s")
+    print(
+        f"Re-run (no-op):   {rerun_seconds:.3f}s ({inserted} inserted, {updated} updated)"
+    )
@@ -0,0 +1,106 @@
+import json
+import subprocess
+import sys
+import time
+
+# Run from the repository root: python -m benchmarks.memory [largest] [years] [chunk_rows]
+#
+# Peak RSS of recomputing metrics and signals for a growing universe, whole
+# (every ticker's rows in one frame) or streamed in chunks of whole tickers.
+# Each run is a fresh process started from this small parent: Linux carries
+# ru_maxrss across exec, so the parent never holds the synthetic market.
+
+PREFIX = "BENCH_MEM_"
+
+
+def child(mode, count, chunk_rows):
+    from db_manager import storage
+    from instrumentation import peak_rss_bytes
+    from main import check_panel_signals, update_panel_metrics
+
+    tickers = [f"{PREFIX}SYN{i:04d}" for i in range(count)]
+    # Warm the imports and the connection so the baseline covers them
+    storage.read_frame("SELECT 1 AS one")
+    baseline = peak_rss_bytes()
+    chunk_rows = chunk_rows if mode == "chunked" else None
+    start = time.perf_counter()
+    updated = update_panel_metrics(tickers, chunk_rows=chunk_rows)
+    saved = check_panel_signals(tickers, chunk_rows=chunk_rows)
+    seconds = time.perf_counter() - start
+    print(
+        json.dumps(
+            {
+                "peak": peak_rss_bytes(),
+                "baseline": baseline,
+                "seconds": seconds,
+                "updated": updated,
+                "saved": saved,
+            }
+        )
+    )
+
+
+def load(count, years):
+    from benchmarks.synthetic import synthetic_market
+    from db_manager import create_tables, load_stock_data
+
+    market = synthetic_market(count, years)
+    create_tables()
+    load_stock_data({PREFIX + ticker: df for ticker, df in market.items()})
+
+
+def clear():
+    from db_manager import storage
+
+    with storage.transaction() as transaction:
+        for table in ("stocks", "signals", "latest_snapshot", "stock_rollups"):
+            transaction.execute(
+                f"DELETE FROM {table} WHERE ticker LIKE :prefix",
+                {"prefix": PREFIX + "%"},
+            )
+
+
+def run_child(*args):
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.memory", *map(str, args)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip().splitlines()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        sys.exit()
+    if sys.argv[1:2] == ["--load"]:
+        load(int(sys.argv[2]), float(sys.argv[3]))
+        sys.exit()
+    if sys.argv[1:2] == ["--clear"]:
+        clear()
+        sys.exit()
+
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    years = float(sys.argv[2]) if len(sys.argv) > 2 else 2
+    chunk_rows = int(sys.argv[3]) if len(sys.argv) > 3 else 50_000
+
+    run_child("--load", largest, years)
+
+    print("-" * 76)
+    print(
+        f"{'Tickers':<10}{'Mode':<10}{'peak RSS':>12}{'over baseline':>16}"
+        f"{'time':>10}{'signals':>10}"
+    )
+    sizes = [n for n in (250, 500, 1000, 2000, 4000) if n < largest] + [largest]
+    for count in sizes:
+        for mode in ("whole", "chunked"):
+            result = json.loads(run_child("--child", mode, count, chunk_rows)[-1])
+            growth = result["peak"] - result["baseline"]
+            print(
+                f"{count:<10}{mode:<10}{result['peak'] / 2**20:>9.0f} MiB"
+                f"{growth / 2**20:>12.0f} MiB{result['seconds']:>9.2f}s"
+                f"{result['saved']:>10}"
+            )
+
+    run_child("--clear")
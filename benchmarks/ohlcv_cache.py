@@ -0,0 +1,39 @@
+import sys
+import tempfile
+import time
+from benchmarks.fetch import SlowFileProvider
+from benchmarks.synthetic import synthetic_market
+from fetchers import fetch_historical_data
+from ohlcv_cache import CachedProvider, OHLCVCache
+
+# Run from the repository root: python -m benchmarks.ohlcv_cache [tickers] [latency_ms]
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 250) / 1000
+
+    with tempfile.TemporaryDirectory() as fixtures, tempfile.TemporaryDirectory() as cache_dir:
+        names = [f"T{i:04d}" for i in range(tickers)]
+        market = synthetic_market(tickers, start="2000-01-03", bars=5000)
+        for name, history in zip(names, market.values()):
+            history.to_parquet(f"{fixtures}/{name}.parquet")
+        provider = CachedProvider(
+            SlowFileProvider(fixtures, latency), OHLCVCache(cache_dir)
+        )
+
+        timings = {}
+        for run, (start_date, end_date) in {
+            "cold": ("2000-01-01", "2015-01-01"),
+            "warm": ("2000-01-01", "2015-01-01"),
+            "extend one year": ("2000-01-01", "2016-01-01"),
+        }.items():
+            start = time.perf_counter()
+            fetch_historical_data(
+                names, start_date, end_date, provider=provider, max_workers=8
+            )
+            timings[run] = time.perf_counter() - start
+
+    print("-" * 50)
+    print(f"Tickers: {tickers}, simulated latency: {latency * 1000:.0f}ms")
+    for run, seconds in timings.items():
+        print(f"{run:<16} {seconds:.2f}s")
@@ -0,0 +1,51 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.incremental_metrics import METRIC_NAMES, stocks_frame
+from main import calculate_metrics, calculate_panel_metrics
+
+# Run from the repository root: python -m benchmarks.panel_metrics [tickers] [bars]
+
+
+def synthetic_universe(tickers, bars):
+    # Vary history lengths so tickers don't share a calendar
+    rng = np.random.default_rng(1)
+    frames = []
+    for i in range(tickers):
+        df = stocks_frame(int(bars * rng.uniform(0.5, 1.0)), seed=i)
+        df.insert(0, "ticker", f"T{i:04d}")
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    bars = int(sys.argv[2]) if len(sys.argv) > 2 else 2500
+
+    universe = synthetic_universe(tickers, bars)
+
+    start = time.perf_counter()
+    per_ticker = pd.concat(
+        [calculate_metrics(df.copy()) for _, df in universe.groupby("ticker")],
+        ignore_index=True,
+    )
+    per_ticker_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    panel = calculate_panel_metrics(universe)
+    panel_seconds = time.perf_counter() - start
+
+    for name in METRIC_NAMES:
+        np.testing.assert_allclose(
+            panel[name].to_numpy(),
+            per_ticker[name].to_numpy(),
+            rtol=1e-12,
+            err_msg=name,
+        )
+
+    print("-" * 50)
+    print(f"Tickers: {tickers}, rows: {len(universe)} (matches per-ticker)")
+    print(f"Per-ticker loop: {per_ticker_seconds:.3f}s")
+    print(f"Panel:           {panel_seconds:.3f}s")
+    print(f"Speedup:         {per_ticker_seconds / panel_seconds:.1f}x")
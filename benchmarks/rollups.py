@@ -0,0 +1,114 @@
+import json
+import sys
+import time
+import app
+from benchmarks.synthetic import synthetic_market
+from db_manager import create_tables, load_stock_data, refresh_rollups, storage
+from main import update_metrics_incremental, update_panel_metrics
+
+# Run from the repository root: python -m benchmarks.rollups [tickers] [years] [width]
+#
+# Full-range stock-graph renders on daily bars against the resolution the
+# callback now picks for the view, and what keeping the weekly and monthly
+# rollups current costs: a full rebuild versus extending by a few bars.
+
+PREFIX = "BENCH_ROLLUP_"
+NEW_BARS = 5
+
+
+def render(client, selected, width, resolution=None):
+    # Resolution None lets update_graph choose; otherwise it is forced
+    payload = {
+        "output": "stock-graph.figure",
+        "outputs": {"id": "stock-graph", "property": "figure"},
+        "inputs": [
+            {"id": "stock-dropdown", "property": "value", "value": selected},
+            {"id": "stock-graph", "property": "relayoutData", "value": None},
+            {"id": "graph-width", "property": "data", "value": width},
+        ],
+        "changedPropIds": ["stock-dropdown.value"],
+        "state": [],
+    }
+    chosen = app.choose_resolution
+    if resolution is not None:
+        app.choose_resolution = lambda x_range, width: resolution
+    try:
+        app.query_cache.clear()
+        start = time.perf_counter()
+        response = client.post("/_dash-update-component", json=payload)
+        seconds = time.perf_counter() - start
+    finally:
+        app.choose_resolution = chosen
+    assert response.status_code == 200, response.status_code
+    # Everything the callback read is what it left in the emptied cache
+    read = sum(len(frame) for _, frame, _ in app.query_cache.entries.values())
+    figure = json.loads(response.data)["response"]["stock-graph"]["figure"]
+    points = sum(
+        len(trace["x"]) for trace in figure["data"] if trace["name"].startswith("Open")
+    )
+    title = figure["layout"]["title"]["text"]
+    return seconds, read, points, len(response.data), title
+
+
+def clear_bench_rows(tickers):
+    with storage.transaction() as transaction:
+        for table in ("stocks", "signals", "latest_snapshot", "stock_rollups"):
+            transaction.execute(
+                f"DELETE FROM {table} WHERE ticker = ANY(:tickers)",
+                {"tickers": tickers},
+            )
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    years = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+    width = int(sys.argv[3]) if len(sys.argv) > 3 else 1500
+
+    market = synthetic_market(count, years)
+    market = {PREFIX + ticker: df for ticker, df in market.items()}
+    tickers = list(market)
+    create_tables()
+    clear_bench_rows(tickers)
+    load_stock_data({ticker: df.iloc[:-NEW_BARS] for ticker, df in market.items()})
+    update_panel_metrics(tickers)
+
+    client = app.app.server.test_client()
+    print("-" * 72)
+    print(f"{len(tickers)} tickers, {years:g} years, {width}px wide, whole history")
+    print(
+        f"{'Selected':<10}{'bars':<10}{'time':>10}{'rows read':>12}"
+        f"{'points/trace':>14}{'JSON':>12}"
+    )
+    for n in sorted({1, 4, count}):
+        selected = tickers[:n]
+        for resolution in ("day", None):
+            seconds, read, points, size, title = render(
+                client, selected, width, resolution
+            )
+            print(
+                f"{n:<10}{title.split()[0]:<10}{seconds:>9.3f}s{read:>12}"
+                f"{points // n:>14}{size / 1024:>10.0f}KB"
+            )
+
+    print("-" * 72)
+    with storage.transaction() as transaction:
+        start = time.perf_counter()
+        rows = refresh_rollups(transaction, tickers)
+        rebuild = time.perf_counter() - start
+    print(f"Full rebuild:             {rebuild:.3f}s ({rows} rollup rows)")
+
+    load_stock_data(market)
+    start = time.perf_counter()
+    for ticker in tickers:
+        update_metrics_incremental(ticker)
+    extend = time.perf_counter() - start
+    with storage.transaction() as transaction:
+        start = time.perf_counter()
+        rows = refresh_rollups(
+            transaction, tickers, market[tickers[0]].index[-NEW_BARS]
+        )
+        incremental = time.perf_counter() - start
+    print(f"Rollups for {NEW_BARS} new bars:   {incremental:.3f}s ({rows} rollup rows)")
+    print(f"Incremental metrics run:  {extend:.3f}s, rollups included")
+
+    clear_bench_rows(tickers)
@@ -0,0 +1,119 @@
+import sys
+import time
+from sqlalchemy import create_engine, text
+from db_manager import DATABASE_URL
+from migrations import migrate, partition_stocks
+
+# Run from the repository root: python -m benchmarks.schema_plans [tickers] [days]
+#
+# Builds the pre-migration stocks and signals tables in a scratch schema, fills
+# them with synthetic bars (a share of them loaded twice, as re-runs used to),
+# then prints the plans of the hot queries before migrating, after migrating
+# and after partitioning stocks by year.
+
+SCHEMA = "bench_plans"
+
+LEGACY_TABLES = [
+    "CREATE TABLE stocks (id serial PRIMARY KEY, ticker varchar, date date, "
+    "open double precision, high double precision, low double precision, "
+    "close double precision, volume integer, dividends double precision, "
+    'stock_splits double precision, "ten_day_MA" double precision, '
+    '"fifty_day_MA" double precision, "two_hundred_day_MA" double precision, '
+    '"RSI" double precision, "MACD" double precision, '
+    '"Signal_Line" double precision)',
+    "CREATE INDEX ix_stocks_id ON stocks (id)",
+    "CREATE INDEX ix_stocks_ticker ON stocks (ticker)",
+    "CREATE TABLE signals (id serial PRIMARY KEY, ticker varchar, "
+    "signal_type varchar, date date, stock_price double precision, "
+    "volume double precision, stop_loss double precision, "
+    "take_profit double precision)",
+    "CREATE INDEX ix_signals_id ON signals (id)",
+    "CREATE INDEX ix_signals_ticker ON signals (ticker)",
+]
+
+QUERIES = {
+    "ticker history": "SELECT * FROM stocks WHERE ticker = 'T0042' ORDER BY date",
+    "metrics tail": "SELECT date, close FROM stocks "
+    "WHERE ticker = 'T0042' AND date >= DATE '2016-01-01' ORDER BY date",
+    "bar lookup": "SELECT close FROM stocks "
+    "WHERE ticker = 'T0042' AND date = DATE '2014-06-02'",
+    "cross-section": "SELECT ticker, close FROM stocks WHERE date = DATE '2015-03-02'",
+    "ticker signals": "SELECT * FROM signals WHERE ticker = 'T0042' ORDER BY date",
+}
+
+
+def build_dataset(connection, tickers, days):
+    connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    for statement in LEGACY_TABLES:
+        connection.execute(text(statement))
+    # Day-major, as daily loads append bars; every 50th bar is loaded twice
+    connection.execute(
+        text(
+            "INSERT INTO stocks (ticker, date, open, high, low, close, volume, "
+            "dividends, stock_splits) "
+            "SELECT 'T' || lpad(t::text, 4, '0'), DATE '2010-01-01' + d, "
+            "100 + random(), 101 + random(), 99 + random(), 100 + random(), "
+            "1000000, 0, 0 "
+            "FROM generate_series(0, :days - 1) AS d, "
+            "generate_series(1, :tickers) AS t, "
+            "generate_series(1, CASE WHEN (d + t) % 50 = 0 THEN 2 ELSE 1 END)"
+        ),
+        {"tickers": tickers, "days": days},
+    )
+    connection.execute(
+        text(
+            "INSERT INTO signals (ticker, signal_type, date, stock_price, volume, "
+            "stop_loss, take_profit) "
+            "SELECT ticker, 'Buy', date, close, volume, close * 0.97, close * 1.03 "
+            "FROM stocks WHERE id % 10 = 0"
+        )
+    )
+    connection.execute(text("ANALYZE"))
+
+
+def explain_all(bind, label):
+    print("=" * 70)
+    print(label)
+    with bind.connect() as connection:
+        for name, query in QUERIES.items():
+            plan = connection.execute(
+                text(f"EXPLAIN (ANALYZE, BUFFERS, COSTS OFF) {query}")
+            ).scalars()
+            print("-" * 70)
+            print(name)
+            for line in plan:
+                print(f"  {line}")
+
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 2500
+
+    bench_engine = create_engine(
+        DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    with bench_engine.begin() as connection:
+        start = time.perf_counter()
+        build_dataset(connection, tickers, days)
+        rows = connection.execute(text("SELECT count(*) FROM stocks")).scalar()
+        print(f"Built {rows} stocks rows in {time.perf_counter() - start:.1f}s")
+
+    explain_all(bench_engine, "Before: indexes on id and ticker only")
+
+    start = time.perf_counter()
+    migrate(bench_engine)
+    with bench_engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+        unique_rows = connection.execute(text("SELECT count(*) FROM stocks")).scalar()
+    assert unique_rows == tickers * days, unique_rows
+    print(f"Migrated in {time.perf_counter() - start:.1f}s")
+    explain_all(bench_engine, "After: unique (ticker, date) and (ticker, date, type)")
+
+    start = time.perf_counter()
+    partition_stocks(bench_engine, through_year=2010 + days // 365 + 1)
+    print(f"Partitioned in {time.perf_counter() - start:.1f}s")
+    explain_all(bench_engine, "Partitioned: stocks by year of date")
+
+    with bench_engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
@@ -0,0 +1,72 @@
+import statistics
+import sys
+import time
+from benchmarks.synthetic import synthetic_market
+from db_manager import create_tables, load_stock_data, storage
+from main import check_panel_signals, fetch_panel_from_db, update_panel_metrics
+from screener import screen
+
+# Run from the repository root: python -m benchmarks.screener [tickers] [years]
+#
+# Answers the same screen, "RSI under 70 and the 10-day MA crossed above the
+# 50-day MA on the latest bar", from every ticker's full history and from the
+# latest_snapshot table the metrics and signals stages maintain.
+
+PREFIX = "BENCH_SCREEN_"
+FILTER = "{RSI} < 70 && {ticker} contains BENCH_SCREEN_"
+SORT = [{"column_id": "RSI", "direction": "asc"}]
+
+
+def from_history(tickers):
+    panel = fetch_panel_from_db(tickers)
+    above = (panel["ten_day_MA"] > panel["fifty_day_MA"]).astype(float)
+    was_above = above.groupby(panel["ticker"].to_numpy()).shift(1)
+    latest = panel.groupby("ticker").tail(1).index
+    crossed = (above == 1) & (was_above == 0) & (panel["RSI"] < 70)
+    return panel.loc[latest][crossed.loc[latest]].sort_values(["RSI", "ticker"])
+
+
+def from_snapshot():
+    return screen(FILTER, SORT, page_size=10_000, signals_today=["Buy"])
+
+
+def median_seconds(function, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def clear_bench_rows(tickers):
+    with storage.transaction() as transaction:
+        for table in ("stocks", "signals", "latest_snapshot", "stock_rollups"):
+            transaction.execute(
+                f"DELETE FROM {table} WHERE ticker = ANY(:tickers)",
+                {"tickers": tickers},
+            )
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    years = float(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    market = {PREFIX + t: df for t, df in synthetic_market(count, years).items()}
+    tickers = list(market)
+    create_tables()
+    clear_bench_rows(tickers)
+    load_stock_data(market)
+    update_panel_metrics(tickers)
+    check_panel_signals(tickers)
+
+    history_seconds, expected = median_seconds(lambda: from_history(tickers))
+    snapshot_seconds, (actual, _) = median_seconds(from_snapshot)
+    assert list(actual["ticker"]) == list(expected["ticker"])
+
+    print("-" * 50)
+    print(f"Tickers:          {count} ({sum(len(df) for df in market.values())} bars)")
+    print(f"Full history:     {history_seconds * 1000:.1f}ms ({len(expected)} matches)")
+    print(f"latest_snapshot:  {snapshot_seconds * 1000:.1f}ms ({len(actual)} matches)")
+
+    clear_bench_rows(tickers)
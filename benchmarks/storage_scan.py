@@ -0,0 +1,82 @@
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import synthetic_market
+from db_manager import Base, create_tables, load_stock_data, price_frame, storage
+from storage import DuckDBStorage
+
+# Run from the repository root: python -m benchmarks.storage_scan [tickers] [bars]
+#
+# Loads the same synthetic universe into the configured PostgreSQL database and
+# a scratch DuckDB file, then times full-history reads from each backend.
+
+QUERIES = {
+    "full history": "SELECT * FROM stocks WHERE ticker LIKE 'BENCH_SCAN_%' "
+    "ORDER BY ticker, date",
+    "price columns": "SELECT ticker, date, close, volume FROM stocks "
+    "WHERE ticker LIKE 'BENCH_SCAN_%' ORDER BY ticker, date",
+    "per-ticker summary": "SELECT ticker, avg(close) AS mean_close, "
+    "max(high) AS high, sum(volume) AS volume FROM stocks "
+    "WHERE ticker LIKE 'BENCH_SCAN_%' GROUP BY ticker ORDER BY ticker",
+}
+
+
+def best_of(function, repeats=3):
+    timings, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def clear_bench_rows():
+    with storage.transaction() as transaction:
+        transaction.execute("DELETE FROM stocks WHERE ticker LIKE 'BENCH_SCAN_%'")
+
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    bars = int(sys.argv[2]) if len(sys.argv) > 2 else 2500
+    if storage.name != "postgresql":
+        sys.exit("Point DATABASE_URL at PostgreSQL to compare it with DuckDB")
+
+    storage.engine.echo = False
+    market = synthetic_market(tickers, bars=bars)
+    data_dict = {"BENCH_SCAN_" + ticker: df for ticker, df in market.items()}
+    create_tables()
+    clear_bench_rows()
+    load_stock_data(data_dict)
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.duckdb")
+    duckdb_storage = DuckDBStorage(path)
+    duckdb_storage.create_tables(Base.metadata)
+    with duckdb_storage.transaction() as transaction:
+        transaction.copy_frame(
+            "stocks", pd.concat(price_frame(t, df) for t, df in data_dict.items())
+        )
+
+    print("-" * 60)
+    print(f"Rows: {tickers * bars}")
+    print(f"{'Query':<22}{'PostgreSQL':>12}{'DuckDB':>12}{'DuckDB Arrow':>14}")
+    for name, query in QUERIES.items():
+        postgres_seconds, expected = best_of(lambda: storage.read_frame(query))
+        duckdb_seconds, actual = best_of(lambda: duckdb_storage.read_frame(query))
+        arrow_seconds, _ = best_of(lambda: duckdb_storage.read_arrow(query))
+        for column in expected.columns.drop(["id", "ticker", "date"], errors="ignore"):
+            np.testing.assert_allclose(
+                actual[column].to_numpy(dtype=float),
+                expected[column].to_numpy(dtype=float),
+                rtol=1e-12,
+            )
+        print(
+            f"{name:<22}{postgres_seconds:>11.3f}s{duckdb_seconds:>11.3f}s"
+            f"{arrow_seconds:>13.3f}s"
+        )
+
+    clear_bench_rows()
+    duckdb_storage.dispose()
+    os.remove(path)
@@ -0,0 +1,53 @@
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.panel_metrics import synthetic_universe
+from db_manager import METRIC_COLUMNS
+from main import calculate_panel_metrics, detect_signals
+from streaming import ReplayFeed, StreamEngine
+
+# Run from the repository root: python -m benchmarks.streaming [tickers] [bars]
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    bars = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    universe = synthetic_universe(tickers, bars)
+    engine = StreamEngine()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/replay.parquet"
+        universe.to_parquet(path)
+
+        start = time.perf_counter()
+        results = list(engine.run(ReplayFeed(path)))
+        stream_seconds = time.perf_counter() - start
+
+    streamed = pd.DataFrame([row for row, _ in results])
+    streamed = streamed.sort_values(["ticker", "date"], ignore_index=True)
+    streamed_signals = pd.DataFrame([s for _, signals in results for s in signals])
+
+    # Same data through the batch path
+    batch = calculate_panel_metrics(universe).rename(columns=METRIC_COLUMNS)
+    batch_signals = detect_signals(batch)
+
+    for column in METRIC_COLUMNS.values():
+        np.testing.assert_allclose(
+            streamed[column].to_numpy(dtype=float),
+            batch[column].to_numpy(dtype=float),
+            rtol=1e-9,
+            atol=1e-9,
+            err_msg=column,
+        )
+    key = ["ticker", "date", "signal_type"]
+    expected = batch_signals[key].astype(str).sort_values(key, ignore_index=True)
+    got = streamed_signals[key].astype(str).sort_values(key, ignore_index=True)
+    pd.testing.assert_frame_equal(got, expected)
+
+    print("-" * 50)
+    print(f"Bars: {len(universe)}, signals: {len(streamed_signals)} (matches batch)")
+    print(
+        f"Streaming: {stream_seconds:.2f}s, {len(universe) / stream_seconds:,.0f} bars/s"
+    )
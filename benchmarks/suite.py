@@ -0,0 +1,403 @@
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from benchmarks.synthetic import synthetic_market
+
+# Run from the repository root:
+#   python -m benchmarks.suite [--tickers 50] [--years 5] [--seed 0] [--repeat 3]
+#       [--output results.json] [--compare baseline.json] [--max-slowdown 1.25]
+#       [--scenarios metrics,dash] [--database-url URL]
+#
+# Without --database-url every scenario runs against a scratch DuckDB file and
+# parquet fixtures, so the suite needs neither a network nor a database server.
+
+# Worker processes for the parallel pipeline scenario; at least two so the
+# scenario still overlaps database waits on a single core. DuckDB allows
+# one writing process, so there run_pipeline falls back to one worker.
+PIPELINE_WORKERS = max(2, os.cpu_count() or 1)
+
+Scenario = namedtuple("Scenario", "name run setup teardown", defaults=(None, None))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Time every pipeline stage")
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        help="exit non-zero if a scenario's median exceeds the baseline by this factor",
+    )
+    parser.add_argument(
+        "--scenarios", help="comma-separated name prefixes of scenarios to run"
+    )
+    parser.add_argument("--database-url", help="defaults to a scratch DuckDB file")
+    return parser.parse_args(argv)
+
+
+def quiet():
+    # The pipeline prints per ticker; keep that out of the report
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def time_scenario(scenario, repeat):
+    timings, rows = [], 0
+    for _ in range(repeat):
+        if scenario.setup:
+            with quiet():
+                scenario.setup()
+        start = time.perf_counter()
+        with quiet():
+            rows = scenario.run()
+        timings.append(time.perf_counter() - start)
+    if scenario.teardown:
+        with quiet():
+            scenario.teardown()
+    return {
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+        "seconds_max": max(timings),
+        "rows": rows,
+        "rows_per_second": rows / min(timings) if min(timings) else None,
+    }
+
+
+def build_scenarios(market, scratch):
+    # Imported here so DATABASE_URL is set before db_manager opens the storage
+    import pandas as pd
+    import app
+    from backtest import run_backtest
+    from db_manager import create_tables, insert_stock_data, load_stock_data, storage
+    from fetchers import FileProvider, fetch_historical_data
+    from main import (
+        calculate_metrics,
+        calculate_panel_metrics,
+        check_buy_sell_signals,
+        check_panel_signals,
+        detect_signals,
+        fetch_panel_from_db,
+        update_metrics_incremental,
+        update_panel_metrics,
+    )
+    from ohlcv_cache import CachedProvider, OHLCVCache
+    from pipeline import run_pipeline
+
+    tickers = list(market)
+    bars = sum(len(df) for df in market.values())
+    start = min(df.index[0] for df in market.values())
+    end = max(df.index[-1] for df in market.values()) + pd.Timedelta(days=1)
+
+    fixtures = os.path.join(scratch, "fixtures")
+    os.makedirs(fixtures)
+    for ticker, df in market.items():
+        df.to_parquet(os.path.join(fixtures, f"{ticker}.parquet"))
+    cache = OHLCVCache(os.path.join(scratch, "ohlcv_cache"))
+    pipeline_cache = os.path.join(scratch, "pipeline_cache")
+
+    def clear_rows():
+        with storage.transaction() as transaction:
+            for table in ("stocks", "signals", "latest_snapshot", "stock_rollups"):
+                transaction.execute(
+                    f"DELETE FROM {table} WHERE ticker = ANY(:tickers)",
+                    {"tickers": tickers},
+                )
+
+    def populate():
+        # Prices, metrics and signals for the whole universe, as a run leaves them
+        load_stock_data(market)
+        update_panel_metrics(tickers)
+        check_panel_signals(tickers)
+
+    def withhold_last_bars():
+        # Metrics up to date except for five new bars per ticker
+        clear_rows()
+        load_stock_data({ticker: df.iloc[:-5] for ticker, df in market.items()})
+        update_panel_metrics(tickers)
+        load_stock_data(market)
+
+    def fetch(provider):
+        data = fetch_historical_data(tickers, start, end, provider=provider)
+        return sum(len(df) for df in data.values())
+
+    def each_ticker(function):
+        for ticker in tickers:
+            function(ticker)
+        return bars
+
+    def whole_universe(function):
+        function(tickers)
+        return bars
+
+    def rerun_load():
+        # Every bar already stored and unchanged
+        load_stock_data(market)
+        return bars
+
+    def incremental_metrics():
+        for ticker in tickers:
+            update_metrics_incremental(ticker)
+        return 5 * len(tickers)
+
+    def pipeline_run(workers):
+        run_pipeline(
+            tickers,
+            start,
+            end,
+            workers=workers,
+            cache_dir=pipeline_cache,
+            provider_factory=functools.partial(FileProvider, fixtures),
+        )
+        return bars
+
+    def fresh_pipeline():
+        # Every bar fetched from the fixtures and every stage run in full
+        clear_rows()
+        shutil.rmtree(pipeline_cache, ignore_errors=True)
+
+    def graph_request(selected, relayout=None):
+        payload = {
+            "output": "stock-graph.figure",
+            "outputs": {"id": "stock-graph", "property": "figure"},
+            "inputs": [
+                {"id": "stock-dropdown", "property": "value", "value": selected},
+                {"id": "stock-graph", "property": "relayoutData", "value": relayout},
+                {"id": "graph-width", "property": "data", "value": None},
+            ],
+            "changedPropIds": [
+                "stock-graph.relayoutData" if relayout else "stock-dropdown.value"
+            ],
+            "state": [],
+        }
+        response = client.post("/_dash-update-component", json=payload)
+        assert response.status_code == 200, response.status_code
+        return sum(len(market[ticker]) for ticker in selected)
+
+    def table_request(page):
+        payload = {
+            "output": "..stock-table.data...stock-table.page_count..",
+            "outputs": [
+                {"id": "stock-table", "property": "data"},
+                {"id": "stock-table", "property": "page_count"},
+            ],
+            "inputs": [
+                {"id": "stock-dropdown", "property": "value", "value": tickers[:4]},
+                {"id": "stock-table", "property": "page_current", "value": page},
+                {"id": "stock-table", "property": "page_size", "value": 25},
+                {
+                    "id": "stock-table",
+                    "property": "sort_by",
+                    "value": [{"column_id": "close", "direction": "desc"}],
+                },
+                {"id": "stock-table", "property": "filter_query", "value": ""},
+            ],
+            "changedPropIds": ["stock-table.page_current"],
+            "state": [],
+        }
+        response = client.post("/_dash-update-component", json=payload)
+        assert response.status_code == 200, response.status_code
+        return 25
+
+    with quiet():
+        create_tables()
+        clear_rows()
+        populate()
+    panel = fetch_panel_from_db(tickers)
+    per_ticker = [df.copy() for _, df in panel.groupby("ticker")]
+    client = app.app.server.test_client()
+    selected = tickers[:4]
+    zoom = {
+        "xaxis.range[0]": str(end - pd.Timedelta(days=180)),
+        "xaxis.range[1]": str(end),
+    }
+
+    return [
+        Scenario("fetch.file_provider", lambda: fetch(FileProvider(fixtures))),
+        Scenario(
+            "fetch.ohlcv_cache_warm",
+            lambda: fetch(CachedProvider(FileProvider(fixtures), cache)),
+            setup=lambda: fetch(CachedProvider(FileProvider(fixtures), cache)),
+        ),
+        Scenario(
+            "ingest.load_stock_data",
+            lambda: sum(load_stock_data(market)),
+            setup=clear_rows,
+            teardown=populate,
+        ),
+        Scenario("ingest.load_stock_data_rerun", rerun_load),
+        Scenario(
+            "ingest.insert_stock_data",
+            lambda: each_ticker(lambda t: insert_stock_data(t, market[t])),
+            setup=clear_rows,
+            teardown=populate,
+        ),
+        Scenario(
+            "metrics.calculate_metrics",
+            lambda: sum(len(calculate_metrics(df)) for df in per_ticker),
+        ),
+        Scenario(
+            "metrics.calculate_panel_metrics",
+            lambda: len(calculate_panel_metrics(panel)),
+        ),
+        Scenario(
+            "metrics.update_panel_metrics", lambda: whole_universe(update_panel_metrics)
+        ),
+        Scenario(
+            "metrics.update_metrics_incremental",
+            incremental_metrics,
+            setup=withhold_last_bars,
+            teardown=populate,
+        ),
+        Scenario(
+            "signals.detect_signals",
+            lambda: whole_universe(lambda _: detect_signals(panel)),
+        ),
+        Scenario(
+            "signals.check_panel_signals", lambda: whole_universe(check_panel_signals)
+        ),
+        Scenario(
+            "signals.check_buy_sell_signals",
+            lambda: each_ticker(check_buy_sell_signals),
+        ),
+        Scenario(
+            "pipeline.run_pipeline_1_worker",
+            lambda: pipeline_run(1),
+            setup=fresh_pipeline,
+            teardown=populate,
+        ),
+        Scenario(
+            "pipeline.run_pipeline_parallel",
+            lambda: pipeline_run(PIPELINE_WORKERS),
+            setup=fresh_pipeline,
+            teardown=populate,
+        ),
+        Scenario("backtest.run_backtest", lambda: len(run_backtest(tickers)[0])),
+        Scenario(
+            "dash.update_graph_cold",
+            lambda: graph_request(selected),
+            setup=app.query_cache.clear,
+        ),
+        Scenario("dash.update_graph_cached", lambda: graph_request(selected)),
+        Scenario("dash.update_graph_zoom", lambda: graph_request(selected, zoom)),
+        Scenario(
+            "dash.update_stock_table",
+            lambda: table_request(3),
+            setup=app.query_cache.clear,
+        ),
+    ], clear_rows
+
+
+def compare(results, meta, baseline_path, max_slowdown):
+    with open(baseline_path) as f:
+        report = json.load(f)
+    baseline = report["scenarios"]
+    print("-" * 72)
+    for key in ("tickers", "years", "seed", "database", "cpu_count"):
+        if report["meta"].get(key) != meta[key]:
+            print(f"Note: baseline {key} is {report['meta'].get(key)}, now {meta[key]}")
+    print(f"{'Scenario':<40}{'baseline':>10}{'now':>10}{'ratio':>10}")
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, now = baseline[name]["seconds_median"], result["seconds_median"]
+        ratio = now / before if before else float("inf")
+        flag = ""
+        if max_slowdown and ratio > max_slowdown:
+            regressions.append(name)
+            flag = "  <- slower"
+        print(f"{name:<40}{before:>9.3f}s{now:>9.3f}s{ratio:>9.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scratch = tempfile.mkdtemp(prefix="stock-bench-")
+    database_url = args.database_url or "duckdb:///" + os.path.join(
+        scratch, "bench.duckdb"
+    )
+    os.environ["DATABASE_URL"] = database_url
+
+    import numpy as np
+    import pandas as pd
+    import db_manager
+
+    if db_manager.engine is not None:
+        db_manager.engine.echo = False
+
+    market = synthetic_market(args.tickers, args.years, args.seed)
+    scenarios, clear_rows = build_scenarios(market, scratch)
+    if args.scenarios:
+        prefixes = tuple(args.scenarios.split(","))
+        scenarios = [s for s in scenarios if s.name.startswith(prefixes)]
+
+    results = {}
+    print(f"{'Scenario':<40}{'median':>10}{'rows/s':>14}")
+    for scenario in scenarios:
+        results[scenario.name] = time_scenario(scenario, args.repeat)
+        result = results[scenario.name]
+        print(
+            f"{scenario.name:<40}{result['seconds_median']:>9.3f}s"
+            f"{result['rows_per_second'] or 0:>14,.0f}"
+        )
+    if args.database_url:
+        # Leave a shared database as we found it
+        with quiet():
+            clear_rows()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pipeline_workers": PIPELINE_WORKERS,
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "database": db_manager.storage.name,
+            "tickers": args.tickers,
+            "years": args.years,
+            "seed": args.seed,
+            "bars": sum(len(df) for df in market.values()),
+            "repeat": args.repeat,
+        },
+        "scenarios": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.compare and compare(
+        results, report["meta"], args.compare, args.max_slowdown
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import sys
+import numpy as np
+from backtest import resolve_trades, summarize
+from benchmarks.panel_metrics import synthetic_universe
+from db_manager import METRIC_COLUMNS
+from main import build_signal_frame, calculate_panel_metrics, detect_signals
+from sweep import run_sweep
+
+# Run from the repository root: python -m benchmarks.sweep [tickers] [bars] [workers]
+
+DEFAULTS = {
+    "short_window": 10,
+    "long_window": 50,
+    "trend_window": 200,
+    "rsi_period": 14,
+    "rsi_low": 30,
+    "rsi_high": 70,
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+    "stop_pct": 0.03,
+    "target_pct": 0.03,
+}
+
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    bars = int(sys.argv[2]) if len(sys.argv) > 2 else 2500
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    universe = synthetic_universe(tickers, bars)
+    results = run_sweep(universe, workers=workers)
+
+    # The hard-coded parameters must reproduce the stored-signal backtest
+    stocks = calculate_panel_metrics(universe).rename(columns=METRIC_COLUMNS)
+    trades = resolve_trades(build_signal_frame(detect_signals(stocks)), stocks)
+    _, aggregate = summarize(trades)
+    row = results.loc[
+        (results[list(DEFAULTS)] == list(DEFAULTS.values())).all(axis=1)
+    ].iloc[0]
+    assert row["trades"] == aggregate["trades"], (row["trades"], aggregate["trades"])
+    for name in ["total_return", "hit_rate", "win_rate"]:
+        np.testing.assert_allclose(row[name], aggregate[name], rtol=1e-9)
+
+    print("-" * 50)
+    print(f"Default parameters match the backtest ({aggregate['trades']} trades)")
+    print(results.head(10).to_string())
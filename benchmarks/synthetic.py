@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+# Share of tickers paying a quarterly dividend, and yearly odds of a split
+DIVIDEND_PAYERS = 0.6
+SPLITS_PER_YEAR = 0.05
+SPLIT_RATIOS = [2.0, 3.0, 4.0]
+
+
+def synthetic_ticker(bars, rng, start="2015-01-02"):
+    """One yfinance-shaped daily history: adjusted OHLCV, Dividends, Stock Splits.
+
+    Closes follow a geometric random walk with a per-ticker drift and
+    volatility. Prices are split-adjusted as yfinance returns them, so a
+    split only shows up as its ratio in the Stock Splits column.
+    """
+    index = pd.bdate_range(start, periods=bars, name="Date")
+    drift = rng.normal(0.0003, 0.0004)
+    volatility = rng.uniform(0.01, 0.035)
+    close = rng.uniform(20, 400) * np.exp(
+        np.cumsum(rng.normal(drift, volatility, bars))
+    )
+    previous = np.concatenate([close[:1], close[:-1]])
+    open_ = previous * (1 + rng.normal(0, volatility / 4, bars))
+    range_ = np.abs(rng.normal(0, volatility / 2, bars))
+    high = np.maximum(open_, close) * (1 + range_)
+    low = np.minimum(open_, close) * (1 - range_)
+    volume = rng.lognormal(np.log(rng.uniform(2e5, 2e7)), 0.4, bars).astype(np.int64)
+
+    dividends = np.zeros(bars)
+    if rng.random() < DIVIDEND_PAYERS:
+        # Roughly quarterly, at a steady yield of the close
+        payment_days = np.arange(rng.integers(0, 63), bars, 63)
+        dividends[payment_days] = close[payment_days] * rng.uniform(0.002, 0.01)
+
+    splits = np.zeros(bars)
+    split_days = np.flatnonzero(
+        rng.random(bars) < SPLITS_PER_YEAR / TRADING_DAYS_PER_YEAR
+    )
+    splits[split_days] = rng.choice(SPLIT_RATIOS, len(split_days))
+
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Volume": volume,
+            "Dividends": dividends.round(4),
+            "Stock Splits": splits,
+        },
+        index=index,
+    )
+
+
+def synthetic_market(tickers=50, years=5, seed=0, start="2015-01-02", bars=None):
+    """``{ticker: history}`` for SYN0000, SYN0001, ... over ``years`` of bars.
+
+    Each ticker draws from its own (seed, index) stream, so a larger universe
+    keeps the histories of a smaller one with the same seed. ``bars`` sets the
+    length exactly, overriding ``years``.
+    """
+    bars = bars or int(years * TRADING_DAYS_PER_YEAR)
+    return {
+        f"SYN{i:04d}": synthetic_ticker(bars, np.random.default_rng([seed, i]), start)
+        for i in range(tickers)
+    }
@@ -0,0 +1,64 @@
+import sys
+import time
+from sqlalchemy.orm import Session
+from benchmarks.synthetic import synthetic_market
+from db_manager import create_tables, engine, insert_stock_data, storage, Stock
+from main import calculate_metrics, fetch_data_from_db, update_db_with_metrics
+
+# Run from the repository root: python -m benchmarks.update_metrics [bars]
+BENCH_TICKER = "BENCH_METRICS"
+
+
+def legacy_update_db_with_metrics(ticker, df):
+    # The original per-row ORM loop, kept here as the baseline
+    with Session(engine) as session, session.begin():
+        for _, row in df.iterrows():
+            stock = (
+                session.query(Stock)
+                .filter(Stock.ticker == ticker, Stock.date == row["date"])
+                .first()
+            )
+            if stock:
+                stock.ten_day_MA = row["10_day_MA"]
+                stock.fifty_day_MA = row["50_day_MA"]
+                stock.two_hundred_day_MA = row["200_day_MA"]
+                stock.RSI = row["RSI"]
+                stock.MACD = row["MACD"]
+                stock.Signal_Line = row["Signal_Line"]
+
+
+def clear_bench_rows():
+    # Metrics writes also refresh the ticker's snapshot and rollups
+    with storage.transaction() as transaction:
+        for table in ("stocks", "signals", "latest_snapshot", "stock_rollups"):
+            transaction.execute(
+                f"DELETE FROM {table} WHERE ticker = :ticker",
+                {"ticker": BENCH_TICKER},
+            )
+
+
+if __name__ == "__main__":
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    if storage.name != "postgresql":
+        sys.exit("Point DATABASE_URL at PostgreSQL; the per-row ORM baseline needs it")
+
+    create_tables()
+    clear_bench_rows()
+    insert_stock_data(BENCH_TICKER, synthetic_market(1, bars=bars)["SYN0000"])
+    df = calculate_metrics(fetch_data_from_db(BENCH_TICKER))
+
+    start = time.perf_counter()
+    legacy_update_db_with_metrics(BENCH_TICKER, df)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    updated = update_db_with_metrics(BENCH_TICKER, df)
+    bulk_seconds = time.perf_counter() - start
+
+    clear_bench_rows()
+
+    print("-" * 50)
+    print(f"Rows:            {len(df)} ({updated} updated by bulk path)")
+    print(f"Per-row loop:    {legacy_seconds:.3f}s")
+    print(f"UPDATE ... FROM: {bulk_seconds:.3f}s")
+    print(f"Speedup:         {legacy_seconds / bulk_seconds:.1f}x")
@@ -0,0 +1,58 @@
+import numpy as np
+
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of ``threshold`` points preserving shape.
+
+    ``x`` must be increasing and numeric; NaN values in ``y`` are never chosen
+    unless a bucket holds nothing else.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    filled = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0, y)
+
+    # First and last points are always kept; the rest is split into buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[next_start:next_end].mean()
+        next_y = filled[next_start:next_end].mean()
+
+        # Pick the point forming the largest triangle with the last pick
+        # and the average of the next bucket
+        area = np.abs(
+            (x[previous] - next_x) * (filled[start:end] - filled[previous])
+            - (x[previous] - x[start:end]) * (next_y - filled[previous])
+        )
+        area[np.isnan(y[start:end])] = -1
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def minmax_indices(y, buckets):
+    """Indices of each bucket's minimum and maximum, for bar-like series."""
+    n = len(y)
+    if 2 * buckets >= n:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    selected = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        window = y[start:end]
+        if np.isnan(window).all():
+            selected.append(start)
+            continue
+        selected.extend({start + np.nanargmin(window), start + np.nanargmax(window)})
+    return np.unique(selected)
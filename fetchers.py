@@ -0,0 +1,147 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pandas as pd
+import yfinance as yf
+from instrumentation import log
+
+
+class RateLimiter:
+    """Space calls evenly so no more than requests_per_second start each second."""
+
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+
+
+# Yahoo throttles aggressive clients, so keep well under its informal limit
+YAHOO_REQUESTS_PER_SECOND = 4.0
+
+
+class Provider:
+    """Source of daily OHLCV history, shaped like yfinance's Ticker.history().
+
+    Subclasses implement fetch(); history() applies the provider's rate limit.
+    """
+
+    name = "provider"
+
+    def __init__(self, requests_per_second=None):
+        self.limiter = RateLimiter(requests_per_second)
+
+    def history(self, ticker, start_date, end_date):
+        self.limiter.wait()
+        return self.fetch(ticker, start_date, end_date)
+
+    def fetch(self, ticker, start_date, end_date):
+        raise NotImplementedError
+
+
+class YahooProvider(Provider):
+    name = "yahoo"
+
+    def __init__(self, requests_per_second=YAHOO_REQUESTS_PER_SECOND):
+        super().__init__(requests_per_second)
+
+    def fetch(self, ticker, start_date, end_date):
+        return yf.Ticker(ticker).history(period="1d", start=start_date, end=end_date)
+
+
+class FileProvider(Provider):
+    """Serve history from <directory>/<ticker>.parquet or <ticker>.csv fixtures."""
+
+    name = "file"
+
+    def __init__(self, directory, requests_per_second=None):
+        super().__init__(requests_per_second)
+        self.directory = Path(directory)
+
+    def fetch(self, ticker, start_date, end_date):
+        parquet_path = self.directory / f"{ticker}.parquet"
+        if parquet_path.exists():
+            df = pd.read_parquet(parquet_path)
+        else:
+            df = pd.read_csv(
+                self.directory / f"{ticker}.csv", index_col="Date", parse_dates=True
+            )
+        return clip_history(df, start_date, end_date)
+
+
+def clip_history(df, start_date, end_date):
+    # Same half-open [start, end) range yfinance uses
+    tz = getattr(df.index, "tz", None)
+    start = pd.Timestamp(start_date).tz_localize(tz)
+    end = pd.Timestamp(end_date).tz_localize(tz)
+    return df[(df.index >= start) & (df.index < end)]
+
+
+def fetch_with_retry(provider, ticker, start_date, end_date, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            return provider.history(ticker, start_date, end_date)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2**attempt
+            print(f"Fetching {ticker} failed ({e}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
+def fetch_historical_data(
+    tickers,
+    start_date,
+    end_date,
+    provider=None,
+    max_workers=8,
+    retries=3,
+    backoff=1.0,
+):
+    """Fetch history for many tickers on a bounded thread pool.
+
+    Returns ``{ticker: frame}`` in the order of ``tickers``; a ticker that
+    still fails after its retries is reported and left out rather than
+    aborting the whole fetch.
+    """
+    provider = provider or YahooProvider()
+    data_dict = {}
+    failed = []
+
+    print(f"Fetching data for {len(tickers)} tickers from {provider.name}...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            ticker: executor.submit(
+                fetch_with_retry,
+                provider,
+                ticker,
+                start_date,
+                end_date,
+                retries,
+                backoff,
+            )
+            for ticker in tickers
+        }
+        for ticker, future in futures.items():
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"Giving up on {ticker}: {e}")
+                failed.append(ticker)
+                continue
+            data_dict[ticker] = data
+            log(
+                f"Fetched {len(data)} records for {ticker} from {start_date} to {end_date}."
+            )
+
+    if failed:
+        print(f"Failed to fetch {len(failed)} tickers: {', '.join(failed)}")
+
+    return data_dict
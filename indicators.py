@@ -0,0 +1,254 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy kernels are the fallback
+    njit = None
+
+# Largest (1 - alpha) ** -k the closed-form NumPy EMA lets a chunk reach
+EMA_MAX_GROWTH = 1e100
+
+DEFAULT_COLUMNS = [
+    "10_day_MA",
+    "50_day_MA",
+    "200_day_MA",
+    "RSI",
+    "12_day_EMA",
+    "26_day_EMA",
+    "MACD",
+    "Signal_Line",
+]
+
+
+# Rolling sums restart their cumulative sum every block so rounding error
+# stays bounded by the block, not the length of the history
+ROLLING_BLOCK = 4096
+
+
+def rolling_sum(values, window):
+    out = np.full(len(values), np.nan)
+    for start in range(window - 1, len(values), ROLLING_BLOCK):
+        end = min(start + ROLLING_BLOCK, len(values))
+        sums = np.cumsum(values[start - window + 1 : end])
+        out[start:end] = sums[window - 1 :]
+        out[start + 1 : end] -= sums[: end - start - 1]
+    return out
+
+
+def rolling_mean(values, window):
+    return rolling_sum(values, window) / window
+
+
+def ema(values, alpha, seed=None):
+    """adjust=False EMA, computed chunk by chunk in closed form instead of a Python loop.
+
+    Without ``seed`` the first value seeds the average, as pandas does; with
+    it, the recursion continues from ``seed``. ``values`` must not contain NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.empty(len(values))
+    if not len(values):
+        return out
+
+    decay = 1 - alpha
+    start = 0
+    previous = seed
+    if seed is None:
+        out[0] = previous = values[0]
+        start = 1
+
+    # Within a chunk: y[t] = decay**(t+1) * y[-1] + alpha * sum(decay**(t-k) * x[k]),
+    # with chunks as long as decay ** -k stays within EMA_MAX_GROWTH
+    chunk_length = int(np.log(EMA_MAX_GROWTH) / -np.log(decay)) if decay > 0 else 1
+    chunk_length = max(1, min(chunk_length, len(values)))
+    steps = np.arange(chunk_length, dtype=float)
+    growth = decay**-steps
+    shrink = decay**steps
+    for i in range(start, len(values), chunk_length):
+        chunk = values[i : i + chunk_length]
+        k = len(chunk)
+        weighted = np.cumsum(chunk * growth[:k])
+        out[i : i + k] = shrink[:k] * (decay * previous + alpha * weighted)
+        previous = out[i + k - 1]
+    return out
+
+
+def simple_rsi(close, period=14):
+    delta = np.diff(close, prepend=close[:1])
+    avg_gain = rolling_mean(np.maximum(delta, 0), period)
+    avg_loss = rolling_mean(np.maximum(-delta, 0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def numpy_default_indicators(close):
+    macd_fast = ema(close, 2 / 13)
+    macd_slow = ema(close, 2 / 27)
+    macd = macd_fast - macd_slow
+    columns = [
+        rolling_mean(close, 10),
+        rolling_mean(close, 50),
+        rolling_mean(close, 200),
+        simple_rsi(close, 14),
+        macd_fast,
+        macd_slow,
+        macd,
+        ema(macd, 2 / 10),
+    ]
+    return dict(zip(DEFAULT_COLUMNS, columns))
+
+
+def fused_default_kernel(close, out):
+    # One pass over close filling every DEFAULT_COLUMNS row of out (8 x n)
+    n = len(close)
+    sum_10 = sum_50 = sum_200 = 0.0
+    gain_sum = loss_sum = 0.0
+    fast = slow = signal = 0.0
+    for i in range(n):
+        price = close[i]
+
+        sum_10 += price
+        sum_50 += price
+        sum_200 += price
+        if i >= 10:
+            sum_10 -= close[i - 10]
+        if i >= 50:
+            sum_50 -= close[i - 50]
+        if i >= 200:
+            sum_200 -= close[i - 200]
+        out[0, i] = sum_10 / 10 if i >= 9 else np.nan
+        out[1, i] = sum_50 / 50 if i >= 49 else np.nan
+        out[2, i] = sum_200 / 200 if i >= 199 else np.nan
+
+        delta = price - close[i - 1] if i > 0 else 0.0
+        gain_sum += max(delta, 0.0)
+        loss_sum += max(-delta, 0.0)
+        if i >= 14:
+            old_delta = close[i - 14] - close[i - 15] if i > 14 else 0.0
+            gain_sum -= max(old_delta, 0.0)
+            loss_sum -= max(-old_delta, 0.0)
+        if i < 13 or (gain_sum == 0.0 and loss_sum == 0.0):
+            out[3, i] = np.nan
+        elif loss_sum == 0.0:
+            out[3, i] = 100.0
+        else:
+            out[3, i] = 100 - (100 / (1 + gain_sum / loss_sum))
+
+        if i == 0:
+            fast = slow = price
+        else:
+            fast = (1 - 2 / 13) * fast + (2 / 13) * price
+            slow = (1 - 2 / 27) * slow + (2 / 27) * price
+        macd = fast - slow
+        signal = macd if i == 0 else (1 - 2 / 10) * signal + (2 / 10) * macd
+        out[4, i] = fast
+        out[5, i] = slow
+        out[6, i] = macd
+        out[7, i] = signal
+
+
+compiled_default_kernel = njit(cache=True)(fused_default_kernel) if njit else None
+
+
+def default_indicators(close, use_numba=None):
+    """calculate_metrics' indicator set for one ticker's closes, as float64 arrays.
+
+    Uses the compiled single-pass kernel when Numba is installed (or
+    ``use_numba`` is True, which raises ImportError without Numba) and the
+    NumPy kernels otherwise.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    use_numba = compiled_default_kernel is not None if use_numba is None else use_numba
+    if use_numba and compiled_default_kernel is None:
+        raise ImportError("use_numba=True needs Numba installed")
+    if not use_numba:
+        return numpy_default_indicators(close)
+
+    out = np.empty((len(DEFAULT_COLUMNS), len(close)))
+    compiled_default_kernel(close, out)
+    return dict(zip(DEFAULT_COLUMNS, out))
+
+
+# name -> (function, input columns); each function returns {column: array}
+INDICATORS = {}
+
+
+def indicator(name, *inputs):
+    def register(function):
+        INDICATORS[name] = (function, inputs)
+        return function
+
+    return register
+
+
+@indicator("default", "close")
+def default_indicator_set(close):
+    return default_indicators(close)
+
+
+@indicator("bollinger", "close")
+def bollinger_bands(close, window=20, num_std=2.0):
+    # Population standard deviation over the window, the usual Bollinger choice
+    middle = rolling_mean(close, window)
+    spread = np.full(len(close), np.nan)
+    if len(close) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(close, window)
+        spread[window - 1 :] = num_std * windows.std(axis=1)
+    return {
+        "BB_middle": middle,
+        "BB_upper": middle + spread,
+        "BB_lower": middle - spread,
+    }
+
+
+def wilder_smooth(values, period):
+    # Seeded with the mean of the first period values, then alpha = 1 / period
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        out[period - 1] = values[:period].mean()
+        out[period:] = ema(values[period:], 1 / period, seed=out[period - 1])
+    return out
+
+
+@indicator("atr", "high", "low", "close")
+def average_true_range(high, low, close, period=14):
+    previous_close = np.concatenate([[np.nan], close[:-1]])
+    true_range = np.fmax(
+        high - low,
+        np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)),
+    )
+    return {"ATR": wilder_smooth(true_range, period)}
+
+
+@indicator("wilder_rsi", "close")
+def wilder_rsi(close, period=14):
+    delta = np.diff(close)
+    out = np.full(len(close), np.nan)
+    avg_gain = wilder_smooth(np.maximum(delta, 0), period)
+    avg_loss = wilder_smooth(np.maximum(-delta, 0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = 100 - (100 / (1 + avg_gain / avg_loss))
+    return {"Wilder_RSI": out}
+
+
+@indicator("vwap", "high", "low", "close", "volume")
+def vwap(high, low, close, volume, window=None):
+    # Cumulative over the whole history, or rolling over ``window`` bars
+    typical_volume = (high + low + close) / 3 * volume
+    if window is None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {"VWAP": np.cumsum(typical_volume) / np.cumsum(volume)}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "VWAP": rolling_sum(typical_volume, window) / rolling_sum(volume, window)
+        }
+
+
+def add_indicators(df, names=("default",)):
+    """Add the named registered indicators to a stocks frame of one ticker."""
+    for name in names:
+        function, inputs = INDICATORS[name]
+        arrays = [df[column].to_numpy(dtype=np.float64) for column in inputs]
+        for column, values in function(*arrays).items():
+            df[column] = values
+    return df
@@ -1,17 +1,12 @@
-import pandas as pd
-from db_manager import session_scope, Stock
+from db_manager import bulk_update_stock_metrics, storage
 
 
 def fetch_data_from_db(ticker):
-    with session_scope() as session:
-        data = (
-            session.query(Stock)
-            .filter(Stock.ticker == ticker)
-            .order_by(Stock.date)
-            .all()
-        )
-        df = pd.DataFrame([(d.date, d.close) for d in data], columns=["Date", "Close"])
-    return df
+    query = (
+        'SELECT date AS "Date", close AS "Close" FROM stocks '
+        "WHERE ticker = :ticker ORDER BY date"
+    )
+    return storage.read_frame(query, {"ticker": ticker})
 
 
 def calculate_metrics(df):
@@ -39,22 +34,7 @@ def calculate_metrics(df):
 
 
 def update_db_with_metrics(ticker, df):
-    with session_scope() as session:
-        for _, row in df.iterrows():
-            stock = (
-                session.query(Stock)
-                .filter(Stock.ticker == ticker, Stock.date == row["Date"])
-                .first()
-            )
-            if stock:
-                stock.ten_day_MA = row["10_day_MA"]
-                stock.fifty_day_MA = row["50_day_MA"]
-                stock.two_hundred_day_MA = row["200_day_MA"]
-                stock.RSI = row["RSI"]
-                stock.MACD = row["MACD"]
-                stock.Signal_Line = row["Signal_Line"]
-
-                # Add other indicators as needed
+    return bulk_update_stock_metrics(df.rename(columns={"Date": "date"}), ticker=ticker)
 
 
 if __name__ == "__main__":
@@ -1,68 +1,29 @@
-import numpy as np
-import pandas as pd
 from individual_scripts.fetch_data import fetch_data_from_db
-from db_manager import insert_signal_data
+from db_manager import replace_signal_data
+from signal_rules import detect_signal_frame
 
 
 def detect_signals(data):
-    signals = []
-    data = data.dropna(
-        subset=[
-            "ten_day_MA",
-            "fifty_day_MA",
-            "two_hundred_day_MA",
-            "RSI",
-            "MACD",
-            "Signal_Line",
-        ]
-    )
-    data["short_long_MA_cross"] = np.where(
-        data["ten_day_MA"] > data["fifty_day_MA"], 1, 0
-    )
+    return detect_signal_frame(data)
 
-    # Identify potential buy/sell signals based on the derived metrics
-    buy_signals = data[data["short_long_MA_cross"].diff() == 1].index
-    for date in buy_signals:
-        signals.append(("Buy", date))
 
-    sell_signals = data[data["short_long_MA_cross"].diff() == -1].index
-    for date in sell_signals:
-        signals.append(("Sell", date))
-
-    # RSI-based signals
-    buy_rsi_signals = data[data["RSI"] < 30].index
-    for date in buy_rsi_signals:
-        signals.append(("Potential Buy (oversold)", date))
-
-    sell_rsi_signals = data[data["RSI"] > 70].index
-    for date in sell_rsi_signals:
-        signals.append(("Potential Sell (overbought)", date))
-
-    # MACD-based signals
-    buy_macd_signals = data[data["MACD"] > data["Signal_Line"]].index
-    for date in buy_macd_signals:
-        signals.append(("Potential Buy (MACD)", date))
-
-    sell_macd_signals = data[data["MACD"] < data["Signal_Line"]].index
-    for date in sell_macd_signals:
-        signals.append(("Potential Sell (MACD)", date))
+def build_signal_frame(detected_signals):
+    # Shape detect_signals output into signals table rows
+    signals = detected_signals.rename(columns={"price": "stock_price"})[
+        ["ticker", "signal_type", "date", "stock_price", "volume"]
+    ]
+    signals["stop_loss"] = signals["stock_price"] * 0.97
+    signals["take_profit"] = signals["stock_price"] * 1.03
 
     return signals
 
 
 def save_signals_to_db(ticker, detected_signals, data):
-    for signal_type, date_index in detected_signals:
-        date = data.loc[date_index, "date"]
-
-        stock_price = data.loc[date_index, "close"].item()
-        volume = int(data.loc[date_index, "volume"].item())  # Convert to int
-
-        stop_loss = stock_price * 0.97
-        take_profit = stock_price * 1.03
-
-        insert_signal_data(
-            ticker, signal_type, date, stock_price, volume, stop_loss, take_profit
-        )
+    # Without bars there is no date range to replace
+    if data.empty:
+        return 0
+    signals = build_signal_frame(detected_signals)
+    return replace_signal_data(ticker, signals, data["date"].min(), data["date"].max())
 
 
 if __name__ == "__main__":
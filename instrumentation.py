@@ -0,0 +1,254 @@
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Per-row progress and per-statement SQL echo slow large runs down; both are
+# off unless VERBOSE=1 or SQL_ECHO=1 is set in the environment
+VERBOSE = os.environ.get("VERBOSE", "0") not in ("", "0")
+SQL_ECHO = os.environ.get("SQL_ECHO", "0") not in ("", "0")
+
+STATEMENT_KIND = re.compile(r"^\W*(\w+)")
+
+# The stage the running code belongs to, set by span(); statements run
+# outside any span are counted under "none"
+current_stage = ContextVar("current_stage", default="none")
+
+
+def log(message):
+    # Chatty progress output, printed only in verbose mode
+    if VERBOSE:
+        print(message)
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return 0
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def statement_kind(statement):
+    match = STATEMENT_KIND.match(statement)
+    return match.group(1).upper() if match else "OTHER"
+
+
+class Recorder:
+    """Running totals of stage spans and SQL statements for one process.
+
+    Totals are plain dicts keyed by stage (and statement kind), so a worker
+    process can hand them to the parent with drain() and merge().
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # stage -> [spans, seconds, rows]
+        self.stages = {}
+        # (stage, kind) -> [statements, seconds]
+        self.statements = {}
+        # Largest peak RSS reported by a merged worker
+        self.peak_rss = 0
+
+    def add_span(self, stage, seconds, rows=0):
+        with self.lock:
+            totals = self.stages.setdefault(stage, [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += rows
+
+    def record_statement(self, statement, seconds):
+        key = (current_stage.get(), statement_kind(statement))
+        with self.lock:
+            totals = self.statements.setdefault(key, [0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+
+    @contextmanager
+    def timed(self, statement):
+        # For statements that bypass the SQLAlchemy event hooks
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_statement(statement, time.perf_counter() - start)
+
+    def drain(self):
+        with self.lock:
+            snapshot = {
+                "stages": self.stages,
+                "statements": [
+                    [stage, kind, *totals]
+                    for (stage, kind), totals in self.statements.items()
+                ],
+                "peak_rss": peak_rss_bytes(),
+            }
+            self.reset()
+        return snapshot
+
+    def merge(self, snapshot):
+        with self.lock:
+            for stage, (spans, seconds, rows) in snapshot["stages"].items():
+                totals = self.stages.setdefault(stage, [0, 0.0, 0])
+                totals[0] += spans
+                totals[1] += seconds
+                totals[2] += rows
+            for stage, kind, count, seconds in snapshot["statements"]:
+                totals = self.statements.setdefault((stage, kind), [0, 0.0])
+                totals[0] += count
+                totals[1] += seconds
+            self.peak_rss = max(self.peak_rss, snapshot.get("peak_rss", 0))
+
+    def peak_rss_bytes(self):
+        """The highest peak RSS of this process and any merged worker."""
+        return max(self.peak_rss, peak_rss_bytes())
+
+    def stage_summary(self):
+        """``{stage: {...}}`` with span time, rows/s and SQL totals per stage."""
+        with self.lock:
+            summary = {
+                stage: {
+                    "spans": spans,
+                    "seconds": seconds,
+                    "rows": rows,
+                    "rows_per_second": rows / seconds if seconds else None,
+                    "statements": 0,
+                    "statement_seconds": 0.0,
+                }
+                for stage, (spans, seconds, rows) in self.stages.items()
+            }
+            for (stage, _), (count, seconds) in self.statements.items():
+                totals = summary.setdefault(
+                    stage,
+                    {
+                        "spans": 0,
+                        "seconds": 0.0,
+                        "rows": 0,
+                        "rows_per_second": None,
+                        "statements": 0,
+                        "statement_seconds": 0.0,
+                    },
+                )
+                totals["statements"] += count
+                totals["statement_seconds"] += seconds
+        return summary
+
+    def to_dict(self):
+        with self.lock:
+            statements = [
+                {"stage": stage, "kind": kind, "count": count, "seconds": seconds}
+                for (stage, kind), (count, seconds) in sorted(self.statements.items())
+            ]
+        return {
+            "stages": self.stage_summary(),
+            "statements": statements,
+            "peak_rss_bytes": self.peak_rss_bytes(),
+        }
+
+    def prometheus(self, prefix="stock_pipeline"):
+        """The totals in the Prometheus text exposition format."""
+        with self.lock:
+            stages = sorted(self.stages.items())
+            statements = sorted(self.statements.items())
+        lines = []
+        for name, help_text, position in (
+            ("stage_spans_total", "Stage runs", 0),
+            ("stage_seconds_total", "Time spent in each stage", 1),
+            ("stage_rows_total", "Rows processed by each stage", 2),
+        ):
+            lines += [
+                f"# HELP {prefix}_{name} {help_text}",
+                f"# TYPE {prefix}_{name} counter",
+            ]
+            lines += [
+                f'{prefix}_{name}{{stage="{stage}"}} {totals[position]}'
+                for stage, totals in stages
+            ]
+        for name, help_text, position in (
+            ("sql_statements_total", "SQL statements executed", 0),
+            ("sql_seconds_total", "Time spent executing SQL statements", 1),
+        ):
+            lines += [
+                f"# HELP {prefix}_{name} {help_text}",
+                f"# TYPE {prefix}_{name} counter",
+            ]
+            lines += [
+                f'{prefix}_{name}{{stage="{stage}",kind="{kind}"}} {totals[position]}'
+                for (stage, kind), totals in statements
+            ]
+        lines += [
+            f"# HELP {prefix}_peak_rss_bytes Highest peak resident set size of a process",
+            f"# TYPE {prefix}_peak_rss_bytes gauge",
+            f"{prefix}_peak_rss_bytes {self.peak_rss_bytes()}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+recorder = Recorder()
+
+
+@contextmanager
+def span(stage, ticker=None):
+    """Time a block as one run of ``stage`` and attribute its SQL to it.
+
+    Yields a dict the block can set ``rows`` on; ``seconds`` is filled in
+    when the block exits, so callers can log the span afterwards.
+    """
+    info = {"stage": stage, "ticker": ticker, "seconds": 0.0, "rows": 0}
+    token = current_stage.set(stage)
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        info["seconds"] = time.perf_counter() - start
+        current_stage.reset(token)
+        recorder.add_span(stage, info["seconds"], info["rows"])
+
+
+def instrumented(stage):
+    # Decorator form of span() for callbacks
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_engine(engine):
+    """Count and time every statement an SQLAlchemy engine executes."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, params, context, many):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, params, context, many):
+        start = conn.info["query_start"].pop()
+        recorder.record_statement(statement, time.perf_counter() - start)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        starts = (
+            context.connection.info.get("query_start") if context.connection else None
+        )
+        if starts:
+            starts.pop()
+
+    return engine
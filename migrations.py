@@ -0,0 +1,203 @@
+import sys
+from datetime import date
+from sqlalchemy import text
+from db_manager import (
+    DataVersion,
+    LatestSnapshot,
+    SchemaMigration,
+    StockRollup,
+    bump_data_version,
+    engine,
+    refresh_latest_snapshot,
+    refresh_rollups,
+)
+from storage import PostgresTransaction
+
+# Registered by @migration, applied in version order by migrate
+MIGRATIONS = []
+
+# pg_advisory_xact_lock key so concurrent migrate calls run one at a time
+MIGRATION_LOCK = 0x5354_4F43
+
+
+def migration(version, description):
+    def register(function):
+        MIGRATIONS.append((version, description, function))
+        return function
+
+    return register
+
+
+@migration(1, "EMA state columns on stocks")
+def add_ema_columns(connection):
+    # create_all does not add columns to an existing stocks table
+    for column in ("twelve_day_EMA", "twenty_six_day_EMA"):
+        connection.execute(
+            text(
+                f'ALTER TABLE stocks ADD COLUMN IF NOT EXISTS "{column}" '
+                "double precision"
+            )
+        )
+
+
+def delete_duplicates(connection, table, key):
+    # Keep the first-loaded row of every key
+    result = connection.execute(
+        text(
+            f"DELETE FROM {table} WHERE id IN (SELECT id FROM ("
+            f"SELECT id, row_number() OVER (PARTITION BY {key} ORDER BY id) AS n "
+            f"FROM {table}) AS numbered WHERE n > 1)"
+        )
+    )
+    if result.rowcount:
+        print(f"Deleted {result.rowcount} duplicate {table} rows")
+
+
+@migration(2, "unique (ticker, date) on stocks")
+def unique_stock_bars(connection):
+    delete_duplicates(connection, "stocks", "ticker, date")
+    connection.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS stocks_ticker_date_key "
+            "ON stocks (ticker, date)"
+        )
+    )
+    # Both are covered by the primary key and the composite index
+    connection.execute(text("DROP INDEX IF EXISTS ix_stocks_ticker"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_stocks_id"))
+
+
+@migration(3, "unique (ticker, date, signal_type) on signals")
+def unique_signals(connection):
+    delete_duplicates(connection, "signals", "ticker, date, signal_type")
+    connection.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS signals_ticker_date_type_key "
+            "ON signals (ticker, date, signal_type)"
+        )
+    )
+    connection.execute(text("DROP INDEX IF EXISTS ix_signals_ticker"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_signals_id"))
+
+
+@migration(4, "latest_snapshot filled from stocks and signals")
+def fill_latest_snapshot(connection):
+    # Later metrics and signals runs keep it current
+    LatestSnapshot.__table__.create(connection, checkfirst=True)
+    # Databases made before data versions existed lack the table bumped below
+    DataVersion.__table__.create(connection, checkfirst=True)
+    transaction = PostgresTransaction(connection)
+    rows = refresh_latest_snapshot(transaction)
+    bump_data_version(transaction, "latest_snapshot")
+    print(f"Filled latest_snapshot for {rows} tickers")
+
+
+@migration(5, "weekly and monthly stock_rollups filled from stocks")
+def fill_stock_rollups(connection):
+    # Later metrics runs extend them
+    StockRollup.__table__.create(connection, checkfirst=True)
+    DataVersion.__table__.create(connection, checkfirst=True)
+    transaction = PostgresTransaction(connection)
+    rows = refresh_rollups(transaction)
+    bump_data_version(transaction, "stock_rollups")
+    print(f"Filled {rows} stock_rollups rows")
+
+
+def migrate(bind=None, target=None):
+    """Apply pending migrations up to ``target`` (default: all) in one transaction.
+
+    Applied versions are recorded in schema_migrations. Returns the versions
+    applied by this call.
+    """
+    applied = []
+    with (bind or engine).begin() as connection:
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK}
+        )
+        SchemaMigration.__table__.create(connection, checkfirst=True)
+        done = {
+            row[0]
+            for row in connection.execute(text("SELECT version FROM schema_migrations"))
+        }
+        for version, description, function in sorted(MIGRATIONS, key=lambda m: m[0]):
+            if version in done or (target is not None and version > target):
+                continue
+            function(connection)
+            connection.execute(
+                text(
+                    "INSERT INTO schema_migrations (version, description) "
+                    "VALUES (:version, :description)"
+                ),
+                {"version": version, "description": description},
+            )
+            applied.append(version)
+            print(f"Applied migration {version}: {description}")
+    return applied
+
+
+def partition_stocks(bind=None, through_year=None):
+    """Rebuild stocks as a table range-partitioned by the year of ``date``.
+
+    Optional, and run after migrate. One partition is created per year from
+    the earliest bar through ``through_year`` (default: next year), plus a
+    default partition; later years need their partitions added before their
+    bars arrive. Returns False if stocks is already partitioned.
+    """
+    with (bind or engine).begin() as connection:
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK}
+        )
+        partitioned = connection.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = 'stocks'::regclass"
+            )
+        ).first()
+        if partitioned:
+            print("stocks is already partitioned")
+            return False
+
+        first = connection.execute(text("SELECT min(date) FROM stocks")).scalar()
+        through_year = through_year or date.today().year + 1
+        first_year = first.year if first else date.today().year
+
+        connection.execute(
+            text(
+                "CREATE TABLE stocks_partitioned (LIKE stocks INCLUDING DEFAULTS) "
+                "PARTITION BY RANGE (date)"
+            )
+        )
+        for year in range(first_year, through_year + 1):
+            connection.execute(
+                text(
+                    f"CREATE TABLE stocks_{year} PARTITION OF stocks_partitioned "
+                    f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+                )
+            )
+        connection.execute(
+            text("CREATE TABLE stocks_default PARTITION OF stocks_partitioned DEFAULT")
+        )
+        connection.execute(text("INSERT INTO stocks_partitioned SELECT * FROM stocks"))
+
+        # Keep the id sequence when the old table goes
+        connection.execute(text("ALTER SEQUENCE stocks_id_seq OWNED BY NONE"))
+        connection.execute(text("DROP TABLE stocks"))
+        connection.execute(text("ALTER TABLE stocks_partitioned RENAME TO stocks"))
+        connection.execute(text("ALTER SEQUENCE stocks_id_seq OWNED BY stocks.id"))
+        # Unique keys on a partitioned table must include the partition key
+        connection.execute(
+            text("ALTER TABLE stocks ADD CONSTRAINT stocks_pkey PRIMARY KEY (id, date)")
+        )
+        connection.execute(
+            text("CREATE UNIQUE INDEX stocks_ticker_date_key ON stocks (ticker, date)")
+        )
+        connection.execute(text("ANALYZE stocks"))
+    print(f"Partitioned stocks by year from {first_year} through {through_year}")
+    return True
+
+
+if __name__ == "__main__":
+    # python migrations.py [--partition]
+    migrate()
+    if "--partition" in sys.argv[1:]:
+        partition_stocks()
@@ -0,0 +1,137 @@
+import json
+import os
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+from fetchers import Provider, clip_history
+
+
+def merge_ranges(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missing_ranges(ranges, start, end):
+    # Parts of [start, end) not covered by the (merged) cached ranges
+    gaps = []
+    for covered_start, covered_end in ranges:
+        if covered_end <= start:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > start:
+            gaps.append([start, covered_start])
+        start = max(start, covered_end)
+    if start < end:
+        gaps.append([start, end])
+    return gaps
+
+
+class OHLCVCache:
+    """On-disk Arrow IPC cache of daily history, one memory-mapped file per ticker.
+
+    Each file's schema metadata records the half-open date ranges it already
+    covers, so callers can fetch only the gaps.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, ticker):
+        return self.directory / f"{ticker}.arrow"
+
+    def ranges(self, ticker):
+        path = self.path(ticker)
+        if not path.exists():
+            return []
+        with pa.memory_map(str(path)) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        return json.loads(metadata.get(b"ranges", b"[]"))
+
+    def read(self, ticker):
+        # Memory-mapped, and split_blocks keeps to_pandas from consolidating copies
+        with pa.memory_map(str(self.path(ticker))) as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(split_blocks=True).set_index("Date")
+
+    def write(self, ticker, df, ranges):
+        table = pa.Table.from_pandas(df.rename_axis("Date").reset_index())
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), b"ranges": json.dumps(ranges).encode()}
+        )
+        path = self.path(ticker)
+        temp_path = path.with_suffix(".arrow.tmp")
+        with pa.OSFile(str(temp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, path)
+
+    def invalidate(self, ticker):
+        self.path(ticker).unlink(missing_ok=True)
+
+
+def corporate_action_dates(df):
+    events = pd.Series(False, index=df.index)
+    for column in ("Dividends", "Stock Splits"):
+        if column in df:
+            events |= df[column].fillna(0) != 0
+    return df.index[events]
+
+
+class CachedProvider(Provider):
+    """Wrap a provider with an OHLCVCache and fetch only the missing date ranges.
+
+    A dividend or split after the start of the cached bars means the provider
+    has back-adjusted prices we already hold, so the ticker's cache is dropped
+    and its whole range refetched.
+    """
+
+    def __init__(self, provider, cache):
+        super().__init__()
+        self.provider = provider
+        self.cache = cache
+        self.name = f"{provider.name} (cached)"
+
+    def history(self, ticker, start_date, end_date):
+        start = pd.Timestamp(start_date).strftime("%Y-%m-%d")
+        end = pd.Timestamp(end_date).strftime("%Y-%m-%d")
+        # Today's bar may still be forming, so never mark it as cached
+        today = pd.Timestamp.today().strftime("%Y-%m-%d")
+
+        ranges = self.cache.ranges(ticker)
+        gaps = missing_ranges(ranges, start, end)
+        if not gaps:
+            return clip_history(self.cache.read(ticker), start, end)
+
+        cached = self.cache.read(ticker) if ranges else None
+        fetched = [self.provider.history(ticker, *gap) for gap in gaps]
+
+        if cached is not None and not cached.empty:
+            events = [corporate_action_dates(df) for df in fetched]
+            if any(len(e) and e.max() > cached.index.min() for e in events):
+                print(f"Corporate action for {ticker}, refetching cached range")
+                self.cache.invalidate(ticker)
+                start = min(start, ranges[0][0])
+                end = max(end, ranges[-1][1])
+                gaps = [[start, end]]
+                ranges, cached = [], None
+                fetched = [self.provider.history(ticker, start, end)]
+
+        frames = [df for df in [cached, *fetched] if df is not None and not df.empty]
+        if frames:
+            df = pd.concat(frames)
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+        else:
+            df = fetched[0]
+
+        covered = [[gap_start, min(gap_end, today)] for gap_start, gap_end in gaps]
+        covered = [r for r in covered if r[0] < r[1]]
+        self.cache.write(ticker, df, merge_ranges(ranges + covered))
+
+        return clip_history(df, start_date, end_date)
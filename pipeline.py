@@ -0,0 +1,168 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import db_manager
+from db_manager import create_tables, load_stock_data
+from fetchers import YAHOO_REQUESTS_PER_SECOND, YahooProvider, fetch_with_retry
+from instrumentation import log, recorder, span
+from main import OHLCV_CACHE_DIR, check_buy_sell_signals, update_metrics_incremental
+from ohlcv_cache import CachedProvider, OHLCVCache
+
+STAGES = ["fetch", "ingest", "metrics", "signals"]
+
+# Set in each worker process by init_worker
+provider = None
+
+
+def init_worker(provider_factory, requests_per_second, cache_dir):
+    global provider
+    # Forked workers must not reuse the parent's pooled connections; dispose
+    # gives each worker its own pool, shared by every ticker it processes
+    db_manager.storage.dispose(close=False)
+    provider = CachedProvider(
+        provider_factory(requests_per_second), OHLCVCache(cache_dir)
+    )
+
+
+def run_ticker(ticker, start_date, end_date, retries=3, backoff=1.0):
+    """Run fetch -> ingest -> metrics -> signals for one ticker, timing each stage.
+
+    Returns the ticker's stage spans and the worker's instrumentation totals
+    for the run, which the parent merges into its own recorder.
+    """
+    with span("fetch", ticker) as fetch:
+        data = fetch_with_retry(
+            provider, ticker, start_date, end_date, retries, backoff
+        )
+        fetch["rows"] = len(data)
+
+    with span("ingest", ticker) as ingest:
+        ingest["rows"] = sum(load_stock_data({ticker: data}))
+
+    with span("metrics", ticker) as metrics:
+        metrics["rows"] = update_metrics_incremental(ticker)
+
+    with span("signals", ticker) as signals:
+        signals["rows"] = check_buy_sell_signals(ticker)
+
+    return [fetch, ingest, metrics, signals], recorder.drain()
+
+
+def print_summary(results, failed, wall_seconds, workers):
+    summary = recorder.stage_summary()
+    print("-" * 74)
+    print(
+        f"{'Stage':<10}{'total (s)':>12}{'mean (s)':>12}{'max (s)':>12}"
+        f"{'rows/s':>12}{'SQL':>8}{'SQL (s)':>8}"
+    )
+    for stage in STAGES:
+        seconds = [
+            s["seconds"]
+            for spans in results.values()
+            for s in spans
+            if s["stage"] == stage
+        ]
+        if seconds:
+            totals = summary[stage]
+            print(
+                f"{stage:<10}{sum(seconds):>12.2f}"
+                f"{sum(seconds) / len(seconds):>12.3f}{max(seconds):>12.3f}"
+                f"{totals['rows_per_second'] or 0:>12,.0f}"
+                f"{totals['statements']:>8}{totals['statement_seconds']:>8.2f}"
+            )
+    rows = sum(spans[0]["rows"] for spans in results.values())
+    busy = sum(s["seconds"] for spans in results.values() for s in spans)
+    print(
+        f"{len(results)} tickers, {rows} bars in {wall_seconds:.2f}s wall clock "
+        f"on {workers} workers ({busy:.2f}s of stage time)"
+    )
+    print(f"Peak RSS: {recorder.peak_rss_bytes() / 2**20:.0f} MiB (largest process)")
+    if failed:
+        print(f"Failed tickers: {', '.join(failed)}")
+
+
+def write_metrics(path, metrics_format):
+    with open(path, "a" if metrics_format == "json" else "w") as f:
+        if metrics_format == "json":
+            f.write(json.dumps({"event": "summary", **recorder.to_dict()}) + "\n")
+        else:
+            f.write(recorder.prometheus())
+
+
+def run_pipeline(
+    tickers,
+    start_date,
+    end_date,
+    workers=None,
+    requests_per_second=YAHOO_REQUESTS_PER_SECOND,
+    cache_dir=OHLCV_CACHE_DIR,
+    metrics_output=None,
+    metrics_format="json",
+    provider_factory=YahooProvider,
+):
+    """Run every ticker's stages as an independent chain across a process pool.
+
+    ``requests_per_second`` is the overall fetch rate; it is split evenly
+    between the workers. With ``metrics_output`` set, stage spans and SQL
+    totals are written there: as JSON lines, one per span as tickers finish
+    plus a closing summary, or as a Prometheus text file when
+    ``metrics_format`` is "prometheus". ``provider_factory`` builds each
+    worker's provider from its share of the request rate, e.g.
+    ``functools.partial(FileProvider, "fixtures")`` to run offline; it must
+    be picklable. Returns ``{ticker: {stage: seconds}}`` for the tickers that
+    completed.
+    """
+    if metrics_format not in ("json", "prometheus"):
+        raise ValueError(f"Unknown metrics format: {metrics_format}")
+    workers = workers or os.cpu_count()
+    if not db_manager.storage.concurrent_writers:
+        # An embedded database file takes one writing process at a time
+        workers = 1
+    create_tables()
+    # Release the parent's connections before the workers open their own
+    db_manager.storage.dispose()
+    recorder.reset()
+    span_log = None
+    if metrics_output and metrics_format == "json":
+        span_log = open(metrics_output, "w")
+
+    results, failed = {}, []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(provider_factory, requests_per_second / workers, cache_dir),
+    ) as executor:
+        futures = {
+            executor.submit(run_ticker, ticker, start_date, end_date): ticker
+            for ticker in tickers
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            ticker = futures[future]
+            try:
+                spans, totals = future.result()
+            except Exception as e:
+                failed.append(ticker)
+                print(f"[{done}/{len(tickers)}] {ticker} failed: {e}")
+                continue
+            results[ticker] = spans
+            recorder.merge(totals)
+            if span_log:
+                for s in spans:
+                    span_log.write(json.dumps({"event": "span", **s}) + "\n")
+                span_log.flush()
+            log(
+                f"[{done}/{len(tickers)}] {ticker} done in "
+                f"{sum(s['seconds'] for s in spans):.2f}s"
+            )
+
+    if span_log:
+        span_log.close()
+    print_summary(results, failed, time.perf_counter() - start, workers)
+    if metrics_output:
+        write_metrics(metrics_output, metrics_format)
+    return {
+        ticker: {s["stage"]: s["seconds"] for s in spans}
+        for ticker, spans in results.items()
+    }
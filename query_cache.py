@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """Bounded LRU of query result frames, evicted by memory footprint.
+
+    Every entry remembers the data version of the table it was read from;
+    versions are re-read at most every ``version_ttl`` seconds, so repeated
+    lookups cost no database round trips while fresh pipeline runs still
+    invalidate stale entries. Cached frames are shared, so callers must not
+    mutate them.
+    """
+
+    def __init__(self, load_versions, max_bytes=256 * 1024**2, version_ttl=5.0):
+        self.load_versions = load_versions
+        self.max_bytes = max_bytes
+        self.version_ttl = version_ttl
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.versions = {}
+        self.versions_checked = float("-inf")
+        self.hits = self.misses = self.evictions = self.version_checks = 0
+        self.lock = threading.Lock()
+
+    def current_version(self, table):
+        with self.lock:
+            if time.monotonic() - self.versions_checked >= self.version_ttl:
+                self.versions = self.load_versions()
+                self.versions_checked = time.monotonic()
+                self.version_checks += 1
+            return self.versions.get(table, 0)
+
+    def get(self, key, table, loader):
+        version = self.current_version(table)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        frame = loader()
+        self.put(key, version, frame)
+        return frame
+
+    def get_many(self, keys, table, loader):
+        """Look up several keys at once, loading all the missing ones in one call.
+
+        ``loader`` receives the list of missing keys and returns ``{key: frame}``
+        for them. Returns the frames in the order of ``keys``.
+        """
+        version = self.current_version(table)
+        frames, missing = {}, []
+
+        with self.lock:
+            for key in keys:
+                entry = self.entries.get(key)
+                if entry is not None and entry[0] == version:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    frames[key] = entry[1]
+                else:
+                    self.misses += 1
+                    missing.append(key)
+
+        if missing:
+            for key, frame in loader(missing).items():
+                self.put(key, version, frame)
+                frames[key] = frame
+
+        return [frames[key] for key in keys]
+
+    def put(self, key, version, frame):
+        size = int(frame.memory_usage(deep=True).sum())
+
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= self.entries.pop(key)[2]
+            self.entries[key] = (version, frame, size)
+            self.bytes += size
+            # Always keep the newest entry, even if it alone exceeds the budget
+            while self.bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, _, evicted_size) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+            self.versions_checked = float("-inf")
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "version_checks": self.version_checks,
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
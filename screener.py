@@ -0,0 +1,57 @@
+from db_manager import SNAPSHOT_SIGNALS, LatestSnapshot, storage
+from table_queries import column_types, page_queries
+
+SNAPSHOT_COLUMNS = column_types(LatestSnapshot)
+
+
+def signals_today_clause(signal_types):
+    # Signals that fired on the ticker's latest bar, e.g. a fresh MA crossover
+    unknown = [t for t in signal_types or [] if t not in SNAPSHOT_SIGNALS]
+    if unknown:
+        raise ValueError(f"Unknown signal type: {', '.join(map(str, unknown))}")
+    clauses = [f"{SNAPSHOT_SIGNALS[t]} = date" for t in signal_types or []]
+    return " AND ".join(clauses) or None
+
+
+def screen_queries(
+    filter_query="", sort_by=None, page_current=0, page_size=50, signals_today=()
+):
+    return page_queries(
+        "latest_snapshot",
+        SNAPSHOT_COLUMNS,
+        page_current,
+        page_size,
+        sort_by,
+        filter_query,
+        where=signals_today_clause(signals_today),
+        key="ticker",
+        strict=True,
+    )
+
+
+def screen(
+    filter_query="", sort_by=None, page_current=0, page_size=50, signals_today=()
+):
+    """Screen every ticker's latest bar without touching its history.
+
+    ``filter_query`` and ``sort_by`` use the DataTable syntax, e.g.
+    ``"{RSI} < 30 && {close} > 10"`` and
+    ``[{"column_id": "RSI", "direction": "asc"}]``; ``signals_today`` lists
+    signal types that must have fired on the latest bar. Raises
+    ``ValueError`` for an unknown signal type or a filter value that doesn't
+    fit its column. Returns one page of latest_snapshot rows and the total
+    number of matches.
+    """
+    rows_query, count_query, params = screen_queries(
+        filter_query, sort_by, page_current, page_size, signals_today
+    )
+    rows = storage.read_frame(rows_query, params)
+    return rows, int(storage.read_frame(count_query, params).iat[0, 0])
+
+
+if __name__ == "__main__":
+    rows, total = screen(
+        "{RSI} < 30", [{"column_id": "RSI", "direction": "asc"}], signals_today=["Buy"]
+    )
+    print(f"{total} tickers oversold with a fresh MA crossover")
+    print(rows[["ticker", "date", "close", "RSI", "last_buy_date"]].to_string())
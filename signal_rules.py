@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+# Bars missing any of these are skipped, as the rules need all of them
+INDICATOR_COLUMNS = [
+    "ten_day_MA",
+    "fifty_day_MA",
+    "two_hundred_day_MA",
+    "RSI",
+    "MACD",
+    "Signal_Line",
+]
+
+# signal_type -> rule; each rule maps a stocks frame to a boolean mask. Rules
+# are also handed a dict of NumPy arrays holding one ticker's consecutive bars
+# (the streaming engine does this), so they should stick to column access,
+# comparisons and previous()
+SIGNAL_RULES = {}
+
+
+def signal_rule(signal_type):
+    def register(rule):
+        SIGNAL_RULES[signal_type] = rule
+        return rule
+
+    return register
+
+
+def previous(data, values):
+    # Value on each ticker's prior bar, NaN on its first bar
+    if isinstance(values, np.ndarray):
+        return np.concatenate([[np.nan], values[:-1]])
+    if "ticker" in data:
+        return values.groupby(data["ticker"].to_numpy()).shift(1)
+    return values.shift(1)
+
+
+def short_above_long(data):
+    return (data["ten_day_MA"] > data["fifty_day_MA"]).astype(float)
+
+
+@signal_rule("Buy")
+def short_long_ma_cross_up(data):
+    above = short_above_long(data)
+    return (above == 1) & (previous(data, above) == 0)
+
+
+@signal_rule("Sell")
+def short_long_ma_cross_down(data):
+    above = short_above_long(data)
+    return (above == 0) & (previous(data, above) == 1)
+
+
+@signal_rule("Potential Buy (oversold)")
+def rsi_oversold(data):
+    return data["RSI"] < 30
+
+
+@signal_rule("Potential Sell (overbought)")
+def rsi_overbought(data):
+    return data["RSI"] > 70
+
+
+@signal_rule("Potential Buy (MACD)")
+def macd_above_signal(data):
+    return data["MACD"] > data["Signal_Line"]
+
+
+@signal_rule("Potential Sell (MACD)")
+def macd_below_signal(data):
+    return data["MACD"] < data["Signal_Line"]
+
+
+def detect_signal_frame(data, rules=None):
+    """Evaluate every rule over a stocks frame of one or many tickers in one pass.
+
+    ``data`` must be sorted by date within each ticker. Returns one row per
+    fired rule with columns ticker, date, signal_type (categorical), price
+    and volume, grouped by rule in registry order and then by bar.
+    """
+    rules = SIGNAL_RULES if rules is None else rules
+    data = data.dropna(subset=INDICATOR_COLUMNS)
+
+    masks = np.vstack(
+        [np.asarray(rule(data), dtype=bool) for rule in rules.values()]
+    ).reshape(len(rules), len(data))
+    rule_index, row_index = np.nonzero(masks)
+
+    return pd.DataFrame(
+        {
+            "ticker": pd.Categorical(data["ticker"].to_numpy()[row_index]),
+            "date": data["date"].to_numpy()[row_index],
+            "signal_type": pd.Categorical.from_codes(
+                rule_index, categories=list(rules)
+            ),
+            "price": data["close"].to_numpy(dtype="float64")[row_index],
+            "volume": data["volume"].to_numpy(dtype="int64")[row_index],
+        }
+    )
@@ -0,0 +1,186 @@
+import math
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from signal_rules import INDICATOR_COLUMNS, SIGNAL_RULES
+
+
+class RollingMean:
+    """Mean of the last ``window`` values, kept as a running sum over a ring buffer."""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = [0.0] * window
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, value):
+        slot = self.count % self.window
+        self.total += value - self.values[slot]
+        self.values[slot] = value
+        self.count += 1
+        # Re-sum exactly once per lap so floating-point drift can't build up;
+        # still O(1) per value amortized
+        if slot == self.window - 1:
+            self.total = math.fsum(self.values)
+        return self.total / self.window if self.count >= self.window else math.nan
+
+
+class EMA:
+    """Exponential moving average matching pandas ewm(span=..., adjust=False)."""
+
+    def __init__(self, span, value=None):
+        self.alpha = 2 / (span + 1)
+        self.value = value
+
+    def update(self, value):
+        if self.value is None:
+            self.value = value
+        else:
+            self.value = (1 - self.alpha) * self.value + self.alpha * value
+        return self.value
+
+
+class RSI:
+    """Simple-moving-average RSI over ``period`` bars, as in calculate_metrics."""
+
+    def __init__(self, period=14):
+        self.previous_close = None
+        self.gains = RollingMean(period)
+        self.losses = RollingMean(period)
+
+    def update(self, close):
+        delta = 0.0 if self.previous_close is None else close - self.previous_close
+        self.previous_close = close
+        avg_gain = self.gains.update(max(delta, 0.0))
+        avg_loss = self.losses.update(max(-delta, 0.0))
+        if math.isnan(avg_gain) or (avg_gain == 0 and avg_loss == 0):
+            return math.nan
+        if avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+class TickerState:
+    """Every calculate_metrics indicator for one ticker, updated in O(1) per bar."""
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+        self.ten_day_MA = RollingMean(10)
+        self.fifty_day_MA = RollingMean(50)
+        self.two_hundred_day_MA = RollingMean(200)
+        self.rsi = RSI(14)
+        self.ema_12 = EMA(12)
+        self.ema_26 = EMA(26)
+        self.signal_line = EMA(9)
+        # Last bar with every indicator filled, for the crossover rules
+        self.last_complete_bar = None
+
+    def update(self, bar):
+        close = float(bar["close"])
+        twelve_day_ema = self.ema_12.update(close)
+        twenty_six_day_ema = self.ema_26.update(close)
+        macd = twelve_day_ema - twenty_six_day_ema
+
+        return {
+            **bar,
+            "ticker": self.ticker,
+            "ten_day_MA": self.ten_day_MA.update(close),
+            "fifty_day_MA": self.fifty_day_MA.update(close),
+            "two_hundred_day_MA": self.two_hundred_day_MA.update(close),
+            "RSI": self.rsi.update(close),
+            "MACD": macd,
+            "Signal_Line": self.signal_line.update(macd),
+            "twelve_day_EMA": twelve_day_ema,
+            "twenty_six_day_EMA": twenty_six_day_ema,
+        }
+
+    def signals(self, row):
+        if any(math.isnan(row[column]) for column in INDICATOR_COLUMNS):
+            return []
+
+        # Run the registered rules on just the previous complete bar and this
+        # one, so crossovers fire exactly as detect_signals would
+        bars = [self.last_complete_bar, row] if self.last_complete_bar else [row]
+        self.last_complete_bar = row
+        window = {
+            column: np.array([bar[column] for bar in bars], dtype=float)
+            for column in INDICATOR_COLUMNS
+        }
+
+        return [
+            {
+                "ticker": self.ticker,
+                "date": row["date"],
+                "signal_type": signal_type,
+                "price": float(row["close"]),
+                "volume": int(row["volume"]),
+            }
+            for signal_type, rule in SIGNAL_RULES.items()
+            if rule(window)[-1]
+        ]
+
+
+class Feed:
+    """Source of bars: dicts with ticker, date, open, high, low, close and volume."""
+
+    def __iter__(self):
+        raise NotImplementedError
+
+
+class ReplayFeed(Feed):
+    """Replay bars from a CSV or Parquet file in date order.
+
+    With ``delay`` set, sleeps that many seconds between bars to imitate a
+    live feed.
+    """
+
+    def __init__(self, path, delay=None):
+        self.path = Path(path)
+        self.delay = delay
+
+    def __iter__(self):
+        if self.path.suffix == ".parquet":
+            bars = pd.read_parquet(self.path)
+        else:
+            bars = pd.read_csv(self.path, parse_dates=["date"])
+        bars = bars.sort_values(["date", "ticker"], kind="stable")
+        for bar in bars.to_dict("records"):
+            yield bar
+            if self.delay:
+                time.sleep(self.delay)
+
+
+class StreamEngine:
+    """Keeps a TickerState per ticker and turns incoming bars into indicators and signals."""
+
+    def __init__(self, on_signal=None):
+        self.states = {}
+        self.on_signal = on_signal
+
+    def state(self, ticker):
+        if ticker not in self.states:
+            self.states[ticker] = TickerState(ticker)
+        return self.states[ticker]
+
+    def warm_up(self, history):
+        # Seed state from stored history (sorted by date) without emitting signals
+        for bar in history.to_dict("records"):
+            state = self.state(bar["ticker"])
+            row = state.update(bar)
+            if not any(math.isnan(row[column]) for column in INDICATOR_COLUMNS):
+                state.last_complete_bar = row
+
+    def process(self, bar):
+        state = self.state(bar["ticker"])
+        row = state.update(bar)
+        signals = state.signals(row)
+        if self.on_signal:
+            for signal in signals:
+                self.on_signal(signal)
+        return row, signals
+
+    def run(self, feed):
+        for bar in feed:
+            yield self.process(bar)
@@ -0,0 +1,225 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import numpy as np
+import pandas as pd
+from backtest import MAX_HOLDING_BARS, first_exits
+from indicators import ema, rolling_mean, simple_rsi
+
+# The hard-coded parameters of calculate_metrics, detect_signals and
+# build_signal_frame, widened into a grid
+DEFAULT_GRID = {
+    "short_window": [5, 10, 20],
+    "long_window": [50, 100],
+    "trend_window": [200],
+    "rsi_period": [7, 14, 21],
+    "rsi_low": [20, 30],
+    "rsi_high": [70, 80],
+    "macd_fast": [8, 12],
+    "macd_slow": [26],
+    "macd_signal": [9],
+    "stop_pct": [0.02, 0.03, 0.05],
+    "target_pct": [0.03, 0.05],
+}
+
+TOTALS = ["trades", "total_return", "hits", "wins"]
+
+# Set in each worker process by init_worker
+combos = None
+families = None
+
+
+def expand_grid(grid=DEFAULT_GRID):
+    """Every combination of the grid's values, skipping inverted MA and MACD pairs."""
+    grid = {**DEFAULT_GRID, **grid}
+    frame = pd.DataFrame(list(product(*grid.values())), columns=list(grid))
+    keep = (frame["short_window"] < frame["long_window"]) & (
+        frame["macd_fast"] < frame["macd_slow"]
+    )
+    return frame[keep].reset_index(drop=True)
+
+
+def trade_outcomes(high, low, close, stop_pct, target_pct, max_holding_bars):
+    # Return and take-profit flag of a long and a short entered at every bar,
+    # with the levels build_signal_frame would store
+    n = len(close)
+    entry_index = np.tile(np.arange(n), 2)
+    direction = np.repeat([1.0, -1.0], n)
+    entry = np.tile(close, 2)
+    lower, upper = entry * (1 - stop_pct), entry * (1 + target_pct)
+    exit_index, exit_price, exit_code = first_exits(
+        entry_index,
+        np.full(2 * n, n - 1),
+        direction,
+        np.where(direction > 0, lower, upper),
+        np.where(direction > 0, upper, lower),
+        high,
+        low,
+        close,
+        max_holding_bars,
+    )
+    returns = (exit_price - entry) * direction / entry
+    hits = exit_code == 1
+    return (returns[:n], hits[:n]), (returns[n:], hits[n:])
+
+
+def suffix_table(keys, signals, outcomes, n):
+    """TOTALS summed from every bar to the end, per distinct parameter key.
+
+    ``signals(key)`` returns the long and short entry masks for a key; a
+    combination's totals are then a lookup at its first tradable bar.
+    """
+    table = np.zeros((len(keys), len(TOTALS), n + 1))
+    for i, key in enumerate(keys.itertuples(index=False)):
+        long, short = signals(key)
+        (long_return, long_hit), (short_return, short_hit) = outcomes[
+            key.stop_pct, key.target_pct
+        ]
+        contributions = np.stack(
+            [
+                long + short,
+                long * long_return + short * short_return,
+                long * long_hit + short * short_hit,
+                long * (long_return > 0) + short * (short_return > 0),
+            ]
+        )
+        table[i, :, :n] = np.cumsum(contributions[:, ::-1], axis=1)[:, ::-1]
+    return table
+
+
+def key_index(frame, columns):
+    keys = frame[columns].drop_duplicates(ignore_index=True)
+    index = frame[columns].merge(keys.reset_index(), how="left")["index"]
+    return keys, index.to_numpy()
+
+
+def sweep_ticker(high, low, close, max_holding_bars=MAX_HOLDING_BARS):
+    """TOTALS for every combination in ``combos`` over one ticker's bars.
+
+    Indicators are computed once per distinct window or span and trade
+    outcomes once per stop/target pair; each rule family then reduces to
+    suffix sums indexed by the combination's first bar past the warm-up.
+    Flat stretches where RSI is undefined are not dropped as
+    calculate_metrics would, they simply never trigger.
+    """
+    n = len(close)
+    means = {
+        window: rolling_mean(close, window)
+        for window in pd.unique(combos[["short_window", "long_window"]].values.ravel())
+    }
+    rsis = {
+        period: simple_rsi(close, period) for period in combos["rsi_period"].unique()
+    }
+    emas = {
+        span: ema(close, 2 / (span + 1))
+        for span in pd.unique(combos[["macd_fast", "macd_slow"]].values.ravel())
+    }
+    outcomes = {
+        (stop, target): trade_outcomes(high, low, close, stop, target, max_holding_bars)
+        for stop, target in combos[["stop_pct", "target_pct"]]
+        .drop_duplicates()
+        .itertuples(index=False)
+    }
+
+    def crosses(key):
+        above = (means[key.short_window] > means[key.long_window]).astype(float)
+        previous = np.concatenate([[np.nan], above[:-1]])
+        return (above == 1) & (previous == 0), (above == 0) & (previous == 1)
+
+    def rsi_levels(key):
+        rsi = rsis[key.rsi_period]
+        return rsi < key.rsi_low, rsi > key.rsi_high
+
+    def macd_sides(key):
+        macd = emas[key.macd_fast] - emas[key.macd_slow]
+        signal_line = ema(macd, 2 / (key.macd_signal + 1))
+        return macd > signal_line, macd < signal_line
+
+    signals = {"crosses": crosses, "rsi_levels": rsi_levels, "macd_sides": macd_sides}
+    totals = np.zeros((len(combos), len(TOTALS)))
+    for name, keys, index, first_bar in families:
+        table = suffix_table(keys, signals[name], outcomes, n)
+        totals += table[index, :, np.minimum(first_bar, n)]
+    return totals
+
+
+def family_plan(grid_combos):
+    # Distinct parameter keys of each rule family, which key every combination
+    # uses and the bar its trades start from; the same for every ticker
+    warm_up = grid_combos[
+        ["short_window", "long_window", "trend_window", "rsi_period"]
+    ].max(axis=1)
+    plan = []
+    for name, columns, lag in [
+        ("crosses", ["short_window", "long_window"], 1),
+        ("rsi_levels", ["rsi_period", "rsi_low", "rsi_high"], 0),
+        ("macd_sides", ["macd_fast", "macd_slow", "macd_signal"], 0),
+    ]:
+        # calculate_metrics drops rows until every rolling window is filled;
+        # crossovers also need the previous bar to be past the warm-up
+        keys, index = key_index(grid_combos, columns + ["stop_pct", "target_pct"])
+        plan.append((name, keys, index, (warm_up - 1 + lag).to_numpy()))
+    return plan
+
+
+def init_worker(grid_combos):
+    global combos, families
+    combos = grid_combos
+    families = family_plan(grid_combos)
+
+
+def sweep_job(arrays):
+    return sweep_ticker(*arrays)
+
+
+def rank_results(grid_combos, totals, rank_by="total_return"):
+    results = grid_combos.copy()
+    results["trades"] = totals[:, 0].astype(np.int64)
+    results["total_return"] = totals[:, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        results["mean_return"] = totals[:, 1] / totals[:, 0]
+        results["hit_rate"] = totals[:, 2] / totals[:, 0]
+        results["win_rate"] = totals[:, 3] / totals[:, 0]
+    return results.sort_values(rank_by, ascending=False, ignore_index=True)
+
+
+def run_sweep(stocks, grid=DEFAULT_GRID, workers=None, rank_by="total_return"):
+    """Evaluate every grid combination over ``stocks`` and rank the results.
+
+    ``stocks`` is a long frame with ticker, date, high, low and close
+    columns. Tickers are spread over a process pool; each worker returns
+    per-combination totals that are summed across the universe.
+    """
+    grid_combos = expand_grid(grid)
+    stocks = stocks.sort_values(["ticker", "date"])
+    arrays = [
+        tuple(
+            group[column].to_numpy(dtype=float) for column in ["high", "low", "close"]
+        )
+        for _, group in stocks.groupby("ticker", sort=False)
+    ]
+    workers = workers or os.cpu_count()
+    print(
+        f"Sweeping {len(grid_combos)} combinations over {len(arrays)} tickers "
+        f"with {workers} workers"
+    )
+
+    start = time.perf_counter()
+    totals = np.zeros((len(grid_combos), len(TOTALS)))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(grid_combos,)
+    ) as executor:
+        chunksize = max(1, len(arrays) // (workers * 4))
+        for ticker_totals in executor.map(sweep_job, arrays, chunksize=chunksize):
+            totals += ticker_totals
+    print(f"Sweep finished in {time.perf_counter() - start:.2f}s")
+    return rank_results(grid_combos, totals, rank_by)
+
+
+if __name__ == "__main__":
+    from main import fetch_panel_from_db
+
+    tickers = ["AAPL", "GOOGL", "MSFT", "AMZN", "META", "TSLA", "NFLX", "NVDA"]
+    results = run_sweep(fetch_panel_from_db(tickers))
+    print(results.head(20).to_string())
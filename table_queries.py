@@ -0,0 +1,149 @@
+import datetime
+import re
+import pandas as pd
+
+# Dash DataTable filter operators (with optional s/i case prefix) mapped to SQL
+COMPARISONS = {
+    "=": "=",
+    "eq": "=",
+    "!=": "!=",
+    "ne": "!=",
+    "<": "<",
+    "lt": "<",
+    "<=": "<=",
+    "le": "<=",
+    ">": ">",
+    "gt": ">",
+    ">=": ">=",
+    "ge": ">=",
+}
+FILTER_PART = re.compile(
+    r"^\{(?P<column>[^}]+)\}\s+(?P<case>[si]?)(?P<operator>contains|datestartswith|"
+    r"eq|ne|lt|le|gt|ge|!=|<=|>=|=|<|>)\s+(?P<value>.+)$"
+)
+
+
+def column_types(model):
+    # DataTable column types for a model's columns
+    types = {}
+    for column in model.__table__.columns:
+        python_type = column.type.python_type
+        if python_type in (int, float):
+            types[column.name] = "numeric"
+        elif python_type is datetime.date:
+            types[column.name] = "datetime"
+        else:
+            types[column.name] = "text"
+    return types
+
+
+def parse_value(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'`":
+        return value[1:-1]
+    return value
+
+
+def comparison_value(value, column_type):
+    # Raises ValueError when the value can't be compared with the column
+    try:
+        if column_type == "numeric":
+            return float(value)
+        # A partial date such as 2016 or 2016-03 means its first day
+        timestamp = pd.Timestamp(value)
+        if timestamp is not pd.NaT:
+            return timestamp.date()
+    except ValueError:
+        pass
+    kind = "a number" if column_type == "numeric" else "a date"
+    raise ValueError(f"Filter value {value!r} is not {kind}")
+
+
+def filter_clauses(filter_query, column_types, strict=False):
+    """Translate a DataTable filter_query into SQL conditions and bind parameters.
+
+    ``column_types`` maps each filterable column to its DataTable column type
+    (``"numeric"``, ``"datetime"`` or ``"text"``); only those columns may
+    appear in the generated SQL. A value that doesn't fit its column matches
+    nothing, or raises ``ValueError`` when ``strict`` is set.
+    """
+    clauses, params = [], {}
+    for i, part in enumerate(filter(None, (filter_query or "").split(" && "))):
+        match = FILTER_PART.match(part.strip())
+        if not match or match["column"] not in column_types:
+            continue
+
+        column = f'"{match["column"]}"'
+        column_type = column_types[match["column"]]
+        operator = match["operator"]
+        value = parse_value(match["value"])
+        name = f"filter_{i}"
+
+        if operator == "contains":
+            like = "LIKE" if match["case"] == "s" else "ILIKE"
+            clauses.append(f"CAST({column} AS TEXT) {like} :{name}")
+            params[name] = f"%{value}%"
+        elif operator == "datestartswith":
+            clauses.append(f"CAST({column} AS TEXT) LIKE :{name}")
+            params[name] = f"{value}%"
+        else:
+            if column_type in ("numeric", "datetime"):
+                try:
+                    value = comparison_value(value, column_type)
+                except ValueError:
+                    if strict:
+                        raise
+                    clauses.append("FALSE")
+                    continue
+            elif match["case"] == "i":
+                column, value = f"LOWER(CAST({column} AS TEXT))", value.lower()
+            clauses.append(f"{column} {COMPARISONS[operator]} :{name}")
+            params[name] = value
+
+    return clauses, params
+
+
+def order_clause(sort_by, column_types):
+    terms = [
+        f'"{sort["column_id"]}" {"DESC" if sort["direction"] == "desc" else "ASC"}'
+        for sort in sort_by or []
+        if sort["column_id"] in column_types
+    ]
+    return ", ".join(terms)
+
+
+def page_queries(
+    table,
+    column_types,
+    page_current,
+    page_size,
+    sort_by=None,
+    filter_query=None,
+    where=None,
+    params=None,
+    key="id",
+    strict=False,
+):
+    """Build the (rows, count) SQL for one page of a server-paged DataTable.
+
+    ``key`` is a unique column used to break sort ties; ``strict`` is passed
+    to filter_clauses.
+    """
+    clauses, filter_params = filter_clauses(filter_query, column_types, strict)
+    clauses = ([where] if where else []) + clauses
+    where_sql = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    # Tie-break on the key so pages stay stable under any sort
+    order_sql = ", ".join(filter(None, [order_clause(sort_by, column_types), key]))
+    params = {
+        **(params or {}),
+        **filter_params,
+        "limit": page_size,
+        "offset": (page_current or 0) * page_size,
+    }
+
+    rows_query = (
+        f"SELECT * FROM {table}{where_sql} ORDER BY {order_sql} "
+        "LIMIT :limit OFFSET :offset"
+    )
+    count_query = f"SELECT count(*) FROM {table}{where_sql}"
+    return rows_query, count_query, params
@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# storage picks its backend from DATABASE_URL when db_manager is first
+# imported, so point it at a throwaway DuckDB file before any test module does
+os.environ["DATABASE_URL"] = "duckdb:///" + os.path.join(
+    tempfile.mkdtemp(prefix="stock_analysis_tests_"), "stocks.duckdb"
+)
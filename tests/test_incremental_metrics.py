@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from benchmarks.synthetic import synthetic_market
+from db_manager import METRIC_COLUMNS, create_tables, load_stock_data, storage
+from main import calculate_metrics, fetch_data_from_db, update_metrics_incremental
+
+TICKER = "TEST_INCR"
+
+
+@pytest.fixture
+def history():
+    create_tables()
+    yield synthetic_market(1, 3)["SYN0000"]
+    with storage.transaction() as transaction:
+        for table in ("stocks", "signals", "latest_snapshot", "stock_rollups"):
+            transaction.execute(
+                f"DELETE FROM {table} WHERE ticker = :ticker", {"ticker": TICKER}
+            )
+
+
+def assert_matches_full_recompute():
+    stored = fetch_data_from_db(TICKER)
+    expected = calculate_metrics(stored[["date", "close"]].copy())
+    for name, column in METRIC_COLUMNS.items():
+        np.testing.assert_allclose(
+            stored[column].to_numpy(float),
+            expected[name].to_numpy(float),
+            rtol=1e-9,
+            err_msg=column,
+        )
+
+
+def test_forward_extension(history):
+    load_stock_data({TICKER: history.iloc[:600]})
+    update_metrics_incremental(TICKER)
+    load_stock_data({TICKER: history.iloc[600:]})
+
+    assert update_metrics_incremental(TICKER) == len(history) - 600
+    assert_matches_full_recompute()
+
+
+def test_backfill(history):
+    load_stock_data({TICKER: history.iloc[200:600]})
+    update_metrics_incremental(TICKER)
+    load_stock_data({TICKER: history.iloc[:200]})
+
+    # Bars before the computed ones shift every EMA after them
+    assert update_metrics_incremental(TICKER) == 600
+    assert_matches_full_recompute()
+
+
+def test_revised_bar(history):
+    load_stock_data({TICKER: history.iloc[:700]})
+    update_metrics_incremental(TICKER)
+    revised = history.iloc[695:].copy()
+    revised.iloc[3, revised.columns.get_loc("Close")] *= 1.05
+    load_stock_data({TICKER: revised})
+
+    # Recomputed from the revised bar on, not from the start of the history
+    assert update_metrics_incremental(TICKER) == len(history) - 698
+    assert_matches_full_recompute()